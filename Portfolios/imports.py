@@ -1,5 +0,0 @@
-from .ProductDesign.main import ui_ux_app
-from .WebDesigner.main import web_designer_app
-from .MobileAppDev.main import mobile_dev_app
-from .MachineLearning.main import machine_learning_app
-from .BackendDev.main import backend_app
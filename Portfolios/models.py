@@ -0,0 +1,48 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+NAME_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 10000
+LINK_MAX_LENGTH = 2048
+PERSON_NAME_MAX_LENGTH = 100
+SUBJECT_MAX_LENGTH = 200
+MESSAGE_MAX_LENGTH = 5000
+EMAIL_MAX_LENGTH = 320
+
+
+class Project(BaseModel):
+    # used for updates, where every field is optional
+    name: Optional[str] = Field(None, max_length=NAME_MAX_LENGTH)
+    description: Optional[str] = Field(None, max_length=DESCRIPTION_MAX_LENGTH)
+    case_study_image_link: Optional[str] = Field(None, max_length=LINK_MAX_LENGTH)
+    case_study_link: Optional[str] = Field(None, max_length=LINK_MAX_LENGTH)
+
+class NewProject(BaseModel):
+    name: str = Field(max_length=NAME_MAX_LENGTH)
+    description: str = Field(max_length=DESCRIPTION_MAX_LENGTH)
+    case_study_image_link: str = Field(max_length=LINK_MAX_LENGTH)
+    case_study_link: str = Field(max_length=LINK_MAX_LENGTH)
+
+class Messages(BaseModel):
+    firstName: str = Field(max_length=PERSON_NAME_MAX_LENGTH)
+    lastName: str = Field(max_length=PERSON_NAME_MAX_LENGTH)
+    subject: str = Field(max_length=SUBJECT_MAX_LENGTH)
+    message: str = Field(max_length=MESSAGE_MAX_LENGTH)
+    emailAddress: str = Field(max_length=EMAIL_MAX_LENGTH)
+
+class ProjectOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    project_id: Optional[str] = None
+    project: Optional[Project] = None
+
+    @model_validator(mode="after")
+    def check_create_has_every_field(self):
+        if self.op == "create":
+            missing_keys = [key for key, value in (self.project or Project()).model_dump().items() if value is None]
+            if missing_keys:
+                raise ValueError(f"Didn't find these fields in request body: {missing_keys}")
+        return self
+
+class BulkProjects(BaseModel):
+    operations: List[ProjectOperation] = Field(max_length=1000)
+    ordered: bool = True
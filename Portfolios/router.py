@@ -0,0 +1,258 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from Portfolios.models import Project, NewProject, Messages, BulkProjects
+from utils.business_logic import get_next_cursor, get_date_range_cursor
+from utils.async_business_logic import get_all_projects_func ,get_particular_project_func ,update_project_func,create_project_func,delete_project_func,delete_contact_func,create_contact_message_func,get_all_contact_messages_func,stream_contact_messages_func,bulk_write_projects_func,delete_all_projects_func,get_contact_messages_by_date_func,purge_contact_messages_func
+from utils.encoding import iter_ndjson, ORJSONResponse
+from utils.write_behind import CONTACT_WRITE_BEHIND
+from utils.http_cache import conditional_json_response, PROJECT_CACHE_CONTROL
+from utils.circuit_breaker import CircuitOpenError, require_closed_circuit, serving_stale, unavailable
+
+MAX_PAGE_SIZE = 100
+# deepest result /v1/search pages to, since every page re-ranks offset + limit matches
+MAX_SEARCH_OFFSET = 400
+# answers 503 at once while Mongo is down; project reads don't use it since they can be served stale
+FAIL_FAST = [Depends(require_closed_circuit)]
+
+
+def parse_fields(fields: Optional[str]):
+    """
+    turns a comma separated `fields` query parameter into a list of field names
+    """
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def create_portfolio_router(DB):
+    """
+    Builds the project and contact routes for one portfolio.
+
+    Every portfolio exposes the same API and only differs in the Mongo
+    database it reads and writes, so the root app includes one router per
+    portfolio under its /v1/... prefix instead of mounting separate apps.
+
+    Args:
+        DB (str): The name of the portfolio's database, e.g. 'ui_ux_portfolio'.
+
+    Returns:
+        APIRouter: The routes, bound to DB.
+    """
+    router = APIRouter()
+
+    @router.get('/get/projects',tags=['Get Projects'])
+    async def get_projects(request: Request, limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None, fields: Optional[str] = None):
+        """
+        returns a list of projects for this app, with an ETag for conditional requests
+
+        pass `limit` (and `after` set to the previous `next_cursor`) to page through the list,
+        and `fields` (e.g. `name,case_study_image_link`) to only return those fields
+        """
+        try:
+            projects = await get_all_projects_func(DB=DB,limit=limit,after=after,fields=parse_fields(fields))
+        except ValueError as e:
+            raise HTTPException(status_code=400,detail=f"Invalid cursor: {e}")
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except:
+            raise HTTPException(status_code=500,detail=f"Couldn't get a projects") 
+        # don't let browsers or the edge keep a stale list once Mongo is back
+        cache_control = "no-store" if serving_stale.get() else PROJECT_CACHE_CONTROL
+        return conditional_json_response(request,{"projects":projects,"next_cursor":get_next_cursor(projects,limit)},cache_control)
+
+    @router.get('/get/project/{projectId}',tags=['Get Projects'])
+    async def get_project(request: Request, projectId:str):
+        """
+        returns a project Object using the project id 
+        """
+        try:
+           project= await get_particular_project_func(DB=DB,projectId=projectId)
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except:
+            raise HTTPException(status_code=500,detail=f"Couldn't get a particular project with projectid {projectId}") 
+
+        if project is None:
+            raise HTTPException(status_code=404,detail="There isn't a project with that project id in the database")
+        cache_control = "no-store" if serving_stale.get() else PROJECT_CACHE_CONTROL
+        return conditional_json_response(request,project,cache_control)
+
+    @router.patch("/update/project/{projectId}",tags=['Update Projects'],dependencies=FAIL_FAST)
+    async def update_project_details(projectId:str, project: Project):
+        """
+        using the projectId it updates a specific project 
+
+        """
+        # this specifies which field should be edited 
+        updated_fields = project.model_dump(exclude_unset=True)
+        try:
+            count = await update_project_func(DB=DB,project_id=projectId,update_fields=updated_fields)
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500,detail=str(e))
+        # malformed ids can't match anything either
+        if "error" in count or count["Affected"]==0:
+            raise HTTPException(status_code=404,detail="There isn't a project with that project id in the database")
+
+        return {"updated project":projectId,"project":updated_fields, "count":count}
+
+    @router.post("/create/project",tags=['Create Projects'],dependencies=FAIL_FAST)
+    async def create_project( project: NewProject):
+        """
+        Creates a new project
+        """
+        try:
+            result = await create_project_func(DB=DB,project=project.model_dump())
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        return {"created project":result}
+
+    @router.delete("/delete/project/{projectid}",tags=['Delete Projects'],dependencies=FAIL_FAST)
+    async def delete_project( projectid:str):
+        """
+        Delets a particular  project
+        """
+        # this specifies which field should be edited 
+        try:
+            count = await delete_project_func(DB=DB,projectId=projectid)
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500 ,detail=f"failed to delete because {e}")
+
+        # malformed ids can't match anything either
+        if "error" in count or count["Affected"]==0:
+            raise HTTPException(status_code=404,detail="There isn't a project with that project id in the database")
+        return count
+
+    @router.delete("/delete/projects",tags=['Delete Projects'],dependencies=FAIL_FAST)
+    async def delete_projects( ):
+        """
+        Delets all projects 
+        """
+        try:
+            count = await delete_all_projects_func(DB=DB)
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500 ,detail=f"failed to delete because {e}")
+        return count
+
+    @router.post("/bulk/projects",tags=['Bulk Projects'],dependencies=FAIL_FAST)
+    async def bulk_projects( bulk: BulkProjects):
+        """
+        Creates, updates and deletes many projects with a single bulk write
+
+        when `ordered` is true (the default) it stops at the first failing operation
+        """
+        operations = []
+        for operation in bulk.operations:
+            project = None
+            if operation.project is not None:
+                project = operation.project.model_dump(exclude_unset=operation.op=="update")
+            operations.append({"op":operation.op,"project_id":operation.project_id,"project":project})
+        try:
+            result = await bulk_write_projects_func(DB=DB,operations=operations,ordered=bulk.ordered)
+        except ValueError as e:
+            raise HTTPException(status_code=422,detail=str(e))
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500 ,detail=f"failed to write because {e}")
+        return result
+
+    @router.delete("/delete/contact/{contactid}",tags=['Contact'],dependencies=FAIL_FAST)
+    async def delete_contact( contactid:str):
+        """
+        Delets a particular  Contact Message
+        """
+        # this specifies which field should be edited 
+        try:
+            count = await delete_contact_func(DB=DB,contact_id=contactid)
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500 ,detail=f"failed to delete because {e}")
+
+        # malformed ids can't match anything either
+        if "error" in count or count["Affected"]==0:
+            raise HTTPException(status_code=404,detail="There isn't a project with that project id in the database")
+        return count
+
+    # with write-behind, messages are still accepted while Mongo is down
+    @router.post("/create/contact",tags=['Contact'],dependencies=[] if CONTACT_WRITE_BEHIND else FAIL_FAST)
+    async def create_contact( messages: Messages):
+        """
+        Create a new Contact Message
+        """
+        try:
+            count = await create_contact_message_func(DB=DB,messages=messages.model_dump())
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500 ,detail=f"failed to create because {e}")
+        return count
+
+
+
+    @router.get('/get/messages',tags=['Contact'],dependencies=FAIL_FAST)
+    async def get_messagess(limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None, fields: Optional[str] = None):
+        """
+        returns a list of messages for this app
+
+        pass `limit` (and `after` set to the previous `next_cursor`) to page through the list,
+        and `fields` to only return those fields
+        """
+        try:
+            projects = await get_all_contact_messages_func(DB=DB,limit=limit,after=after,fields=parse_fields(fields))
+        except ValueError as e:
+            raise HTTPException(status_code=400,detail=f"Invalid cursor: {e}")
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except:
+            raise HTTPException(status_code=500,detail=f"Couldn't get a projects") 
+        return ORJSONResponse({"messages":projects,"next_cursor":get_next_cursor(projects,limit)})
+
+    @router.get('/export/messages',tags=['Contact'],dependencies=FAIL_FAST)
+    async def export_messages():
+        """
+        streams every message for this app as newline-delimited JSON
+        """
+        return StreamingResponse(iter_ndjson(stream_contact_messages_func(DB=DB)),media_type="application/x-ndjson")
+
+    @router.get('/get/messages/range',tags=['Contact'],dependencies=FAIL_FAST)
+    async def get_messages_by_date(start: Optional[datetime] = None, end: Optional[datetime] = None, limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), after: Optional[str] = None):
+        """
+        returns the messages created between `start` (inclusive) and `end` (exclusive), oldest first
+
+        pass `limit` (and `after` set to the previous `next_cursor`) to page through the range
+        """
+        try:
+            messages = await get_contact_messages_by_date_func(DB=DB,start=start,end=end,limit=limit,after=after)
+        except ValueError as e:
+            raise HTTPException(status_code=400,detail=f"Invalid cursor: {e}")
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500,detail=f"Couldn't get messages because {e}")
+        return ORJSONResponse({"messages":messages,"next_cursor":get_date_range_cursor(messages,limit)})
+
+    @router.delete('/delete/messages',tags=['Contact'],dependencies=FAIL_FAST)
+    async def purge_messages(start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """
+        Deletes every message created between `start` (inclusive) and `end` (exclusive)
+        """
+        try:
+            count = await purge_contact_messages_func(DB=DB,start=start,end=end)
+        except ValueError as e:
+            raise HTTPException(status_code=422,detail=str(e))
+        except CircuitOpenError as e:
+            raise unavailable(e.retry_after)
+        except Exception as e:
+            raise HTTPException(status_code=500 ,detail=f"failed to delete because {e}")
+        return count
+
+    return router
@@ -0,0 +1,58 @@
+"""
+Per-document cost of turning a Mongo project document into JSON.
+
+Compares the old str()+regex+quote rewriting that get_all_projects_func
+used to do (plus the json.dumps the route did on top of it) against
+utils.encoding.encode_document followed by a single json.dumps.
+
+Run from the repo root:
+    python -m benchmarks.bench_encoding [number_of_documents]
+"""
+import json
+import re
+import sys
+import timeit
+from datetime import datetime, timezone
+from bson.objectid import ObjectId
+from utils.encoding import encode_document
+
+
+def make_documents(count):
+    return [
+        {
+            "_id": ObjectId(),
+            "name": f"Case study {i}",
+            "description": "A redesign of the client's checkout flow. " * 20,
+            "case_study_image_link": f"https://portfolio.uriri.com.ng/images/{i}.png",
+            "case_study_link": f"https://portfolio.uriri.com.ng/case-studies/{i}",
+            "createdAt": datetime.now(timezone.utc),
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_encode(documents):
+    cleaned_data = []
+    for item in [str(document) for document in documents]:
+        item = re.sub(r"ObjectId\('([a-f0-9]{24})'\)", r'"\1"', item)
+        item = item.replace("'", '"')
+        item = item.replace('\"s', "'s")
+        cleaned_data.append(item)
+    return json.dumps(cleaned_data)
+
+
+def native_encode(documents):
+    return json.dumps([encode_document(document) for document in documents])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    documents = make_documents(count)
+    for label, func in (("before (str+regex)", legacy_encode), ("after (encode_document)", native_encode)):
+        runs = timeit.repeat(lambda: func(documents), number=5, repeat=5)
+        per_document_us = min(runs) / 5 / count * 1e6
+        print(f"{label:<26} {per_document_us:8.2f} us/document")
+
+
+if __name__ == "__main__":
+    main()
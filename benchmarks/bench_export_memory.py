@@ -0,0 +1,132 @@
+"""
+Peak memory of GET /export/messages.
+
+Sends the request through main:app, so the measurement covers what clients
+hit: the route, StreamingResponse, CompressionMiddleware (compressing each
+chunk when the client accepts it) and MetricsMiddleware. Only the Mongo
+cursor is replaced, by synthetic messages made one at a time. Checks that
+peak traced memory stays under a fixed ceiling no matter how many messages
+are exported, and exits with status 1 if it doesn't.
+
+The script plays the server itself and drops each body chunk once it has
+been counted, the way uvicorn writes it to the socket. httpx's
+ASGITransport can't be used for this: it collects the whole response body
+before returning, so the peak would be its own buffer.
+
+Run from the repo root:
+    python -m benchmarks.bench_export_memory [number_of_messages] [ceiling_mb] [accept_encoding]
+
+accept_encoding defaults to "gzip, deflate, br"; pass "identity" to
+measure the uncompressed stream.
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+# the export is a read, but keep the limiter out of the numbers
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+from bson.objectid import ObjectId
+import main
+import Portfolios.router
+
+EXPORT_PATH = next(iter(main.PORTFOLIOS)) + "/export/messages"
+
+
+async def synthetic_messages(count):
+    # Stands in for the Mongo cursor: documents are created one at a time,
+    # the way a cursor hands out one batch at a time.
+    for i in range(count):
+        yield {
+            "_id": ObjectId(),
+            "firstName": "Ada",
+            "lastName": f"Lovelace {i}",
+            "subject": "Working together",
+            "message": "I'd love to talk about a redesign of our product. " * 10,
+            "emailAddress": f"ada{i}@example.com",
+            "currentDate": "Monday, 3rd, March 2025",
+        }
+
+
+async def export(count, accept_encoding):
+    """
+    Sends GET /export/messages through main.app.
+
+    Returns:
+        tuple: (status code, Content-Encoding, bytes sent, chunks sent)
+    """
+    Portfolios.router.stream_contact_messages_func = lambda DB, batch_size=500: synthetic_messages(count)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": EXPORT_PATH,
+        "raw_path": EXPORT_PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = None
+    encoding = None
+    sent = 0
+    chunks = 0
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        # the empty request body, then nothing until the client goes away,
+        # which is once the whole response has been sent
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, encoding, sent, chunks
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = dict(message.get("headers", []))
+            encoding = headers.get(b"content-encoding", b"identity").decode()
+        elif message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+            chunks += 1
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await main.app(scope, receive, send)
+    return status, encoding, sent, chunks
+
+
+def main_cli():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ceiling_mb = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    accept_encoding = sys.argv[3] if len(sys.argv) > 3 else "gzip, deflate, br"
+
+    # one small export first, so imports and lazily built state aren't counted
+    asyncio.run(export(10, accept_encoding))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    status, encoding, sent, chunks = asyncio.run(export(count, accept_encoding))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_mb = peak / 1024 / 1024
+    print(f"GET {EXPORT_PATH} -> {status}, {encoding}")
+    print(f"exported {count} messages ({sent / 1024:.0f} KB sent in {chunks} chunks) in {elapsed:.2f}s")
+    print(f"peak traced memory {peak_mb:.2f} MB (ceiling {ceiling_mb:.2f} MB)")
+    if status != 200 or peak_mb > ceiling_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,63 @@
+"""
+Cold-start cost of `import main`, which every Vercel cold start pays.
+
+Imports main in fresh interpreters and reports the wall time, then prints
+the slowest modules from `python -X importtime`. Pass --max-ms to exit
+with status 1 when the median import time goes over a budget, so
+regressions can be caught in CI.
+
+Run from the repo root:
+    python -m benchmarks.bench_import [--runs 10] [--top 15] [--max-ms 800]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+TIMER = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+
+
+def measure_wall_time(runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", TIMER], capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+    return timings
+
+
+def slowest_imports(top):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    timings = measure_wall_time(args.runs)
+    median = statistics.median(timings)
+    print(f"import main: min {min(timings):.0f} ms, median {median:.0f} ms, max {max(timings):.0f} ms over {args.runs} runs")
+
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, module in slowest_imports(args.top):
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {module}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"\nmedian import time {median:.0f} ms is over the {args.max_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Load test and latency benchmark for the /v1 routes of main:app.
+
+Seeds each portfolio database with synthetic projects and messages, then
+drives the app in-process through httpx's ASGI transport, so the numbers
+cover routing, the business layer and Mongo but not the network or
+uvicorn. Each endpoint is hit `--requests` times with `--concurrency`
+requests in flight, one endpoint after another. Results (req/s and
+p50/p95/p99 latency in ms per endpoint) are printed and written as JSON to
+`--output`, so runs before and after a change can be diffed.
+
+Writes run after the reads of each portfolio, and the single-project and
+single-message deletes remove what the create scenarios just added, one
+document per request. DELETE /delete/projects and /delete/messages are
+left out: they empty a whole portfolio in one call, so every request
+after the first would measure deleting nothing.
+
+Needs a local mongod; point MONGO_URI at it. The portfolio databases
+named in main.PORTFOLIOS are DROPPED and re-seeded, so the script refuses
+to run against a non-local host unless --allow-remote is given.
+
+Run from the repo root:
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.load_test \\
+        --projects 50 --messages 5000 --requests 500 --concurrency 20 --output bench_output.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+# writes are what we want to measure, not the limiter in front of them
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+import httpx
+from bson.objectid import ObjectId
+from utils.database import get_client
+from utils.indexes import ensure_indexes
+import main
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+
+def seed(projects, messages):
+    """
+    Replaces the projects and messages of every portfolio database and
+    creates its indexes. Messages are spread over the last `messages`
+    minutes, one a minute.
+
+    Returns:
+        dict: prefix -> list of seeded project ids.
+    """
+    cli = get_client()
+    project_ids = {}
+    now = datetime.now(timezone.utc)
+    for prefix, DB in main.PORTFOLIOS.items():
+        cli.drop_database(DB)
+        project_documents = [
+            {
+                "_id": ObjectId(),
+                "name": f"Case study {i}",
+                "description": "A redesign of the client's onboarding flow. " * 20,
+                "case_study_image_link": f"https://portfolio.uriri.com.ng/images/{i}.png",
+                "case_study_link": f"https://portfolio.uriri.com.ng/case-studies/{i}",
+            }
+            for i in range(projects)
+        ]
+        if project_documents:
+            cli[DB].project.insert_many(project_documents)
+        for start in range(0, messages, 1000):
+            cli[DB].messages.insert_many([
+                {**make_message(i), "createdAt": now - timedelta(minutes=messages - i)}
+                for i in range(start, min(start + 1000, messages))
+            ])
+        ensure_indexes(DB)
+        project_ids[prefix] = [str(document["_id"]) for document in project_documents]
+    return project_ids
+
+
+def make_message(i):
+    """
+    Returns the body of a contact form submission, as POSTed to /create/contact.
+    """
+    return {
+        "firstName": "Ada",
+        "lastName": f"Lovelace {i}",
+        "subject": "Working together",
+        "message": "I'd love to talk about a redesign of our product. " * 5,
+        "emailAddress": f"ada{i}@example.com",
+    }
+
+
+def next_id(DB, collection, _filter):
+    """
+    Returns a callable giving the id of a different document matching
+    `_filter` on every call, for deletes. The ids are looked up on the first
+    call, so documents created by earlier scenarios are included; once they
+    run out it gives ids that don't exist.
+    """
+    ids = None
+
+    def take():
+        nonlocal ids
+        if ids is None:
+            ids = iter([str(document["_id"]) for document in get_client()[DB][collection].find(_filter, {"_id": 1})])
+        return next(ids, None) or str(ObjectId())
+    return take
+
+
+def build_scenarios(project_ids):
+    """
+    Returns:
+        list: (name, method, path, json body) for every endpoint to measure.
+              The path and body may be callables returning a fresh one per request.
+    """
+    new_project = {
+        "name": "Benchmark project",
+        "description": "Created by the load test",
+        "case_study_image_link": "https://portfolio.uriri.com.ng/images/bench.png",
+        "case_study_link": "https://portfolio.uriri.com.ng/case-studies/bench",
+    }
+    scenarios = [
+        ("GET /v1/projects", "GET", "/v1/projects", None),
+        ("GET /v1/search", "GET", "/v1/search?q=onboarding&limit=20", None),
+    ]
+    for prefix, ids in project_ids.items():
+        DB = main.PORTFOLIOS[prefix]
+        bulk_names = itertools.count()
+        scenarios += [
+            (f"GET {prefix}/get/projects", "GET", f"{prefix}/get/projects", None),
+            (f"GET {prefix}/get/projects?limit=20", "GET", f"{prefix}/get/projects?limit=20&fields=name,case_study_image_link", None),
+            (f"GET {prefix}/get/messages?limit=50", "GET", f"{prefix}/get/messages?limit=50", None),
+            (f"GET {prefix}/get/messages/range", "GET", f"{prefix}/get/messages/range?start=2000-01-01T00:00:00&limit=50", None),
+            (f"GET {prefix}/export/messages", "GET", f"{prefix}/export/messages", None),
+            (f"POST {prefix}/create/contact", "POST", f"{prefix}/create/contact", make_message(0)),
+            (f"POST {prefix}/create/project", "POST", f"{prefix}/create/project", new_project),
+            (f"POST {prefix}/bulk/projects", "POST", f"{prefix}/bulk/projects",
+             lambda bulk_names=bulk_names: {"operations": [
+                 {"op": "create", "project": {**new_project, "name": f"Bulk project {next(bulk_names)}"}}
+                 for _ in range(10)
+             ]}),
+            (f"DELETE {prefix}/delete/project/{{id}}", "DELETE",
+             lambda take=next_id(DB, "project", {"name": new_project["name"]}): f"{prefix}/delete/project/{take()}", None),
+            (f"DELETE {prefix}/delete/contact/{{id}}", "DELETE",
+             lambda take=next_id(DB, "messages", {"lastName": make_message(0)["lastName"]}): f"{prefix}/delete/contact/{take()}", None),
+        ]
+        if ids:
+            # a new name every time, since an update that changes nothing is answered with 404
+            renames = itertools.count()
+            scenarios += [
+                (f"GET {prefix}/get/project/{{id}}", "GET", f"{prefix}/get/project/{ids[0]}", None),
+                (f"PATCH {prefix}/update/project/{{id}}", "PATCH", f"{prefix}/update/project/{ids[-1]}",
+                 lambda renames=renames: {"name": f"Renamed {next(renames)}"}),
+            ]
+    return scenarios
+
+
+async def run_scenario(client, method, path, body, requests, concurrency):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, path() if callable(path) else path, json=body() if callable(body) else body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "p99_ms": round(percentiles[98], 2),
+    }
+
+
+async def run(scenarios, requests, concurrency):
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, path, body in scenarios:
+            # one request outside the measurement to fill the pool and caches
+            await client.request(method, path() if callable(path) else path, json=body() if callable(body) else body)
+            results[name] = await run_scenario(client, method, path, body, requests, concurrency)
+            result = results[name]
+            print(f"{name:<60} {result['rps']:>8} req/s  p50 {result['p50_ms']:>7} ms  "
+                  f"p95 {result['p95_ms']:>7} ms  p99 {result['p99_ms']:>7} ms  errors {result['errors']}")
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=50, help="projects per portfolio database")
+    parser.add_argument("--messages", type=int, default=1000, help="messages per portfolio database")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20, help="requests in flight per endpoint")
+    parser.add_argument("--output", default="bench_output.json", help="where to write the JSON results")
+    parser.add_argument("--allow-remote", action="store_true", help="allow a MONGO_URI that isn't localhost")
+    args = parser.parse_args()
+
+    host = urlparse(os.getenv("MONGO_URI") or "mongodb://localhost").hostname
+    if host not in LOCAL_HOSTS and not args.allow_remote:
+        sys.exit(f"MONGO_URI points at {host}; this script drops the portfolio databases, pass --allow-remote to insist")
+
+    print(f"seeding {args.projects} projects and {args.messages} messages per portfolio")
+    project_ids = seed(args.projects, args.messages)
+    results = asyncio.run(run(build_scenarios(project_ids), args.requests, args.concurrency))
+
+    with open(args.output, "w") as output:
+        json.dump({"config": vars(args), "results": results}, output, indent=2)
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,8 +1,42 @@
-from Portfolios.imports import *
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from Portfolios.router import create_portfolio_router, parse_fields, MAX_PAGE_SIZE, MAX_SEARCH_OFFSET
+from utils.async_business_logic import get_projects_across_portfolios_func, search_projects_across_portfolios_func
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from utils.compression import CompressionMiddleware
+from utils.encoding import ORJSONResponse
+from utils.cache import project_cache, database_cache, missing_project_cache, last_good_cache, search_cache
+from utils.metrics import MetricsMiddleware, render as render_metrics
+from utils.profiling import PROFILING_ENABLED, PROFILING_SECRET, ProfilingMiddleware
+from utils.body_limit import BodySizeLimitMiddleware
+from utils.rate_limit import RATE_LIMIT_ENABLED, RateLimitMiddleware, write_limiter
+from utils.write_behind import CONTACT_WRITE_BEHIND, contact_message_queue
+from utils.warmup import warm_up_until_ready
+from utils.circuit_breaker import CircuitOpenError, unavailable
+from utils.database import close_client, get_async_client, close_async_client
 
-app = FastAPI(docs_url=None,redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # open the shared Mongo pool once; every portfolio router reuses it.
+    # The sync client is only created if a script-style function needs it.
+    get_async_client()
+    app.state.ready = False
+    warmup = asyncio.create_task(warm_up_until_ready(app.state, list(PORTFOLIOS.values())))
+    if CONTACT_WRITE_BEHIND:
+        await contact_message_queue.start()
+    yield
+    warmup.cancel()
+    if CONTACT_WRITE_BEHIND:
+        await contact_message_queue.stop()
+    close_client()
+    await close_async_client()
+
+
+app = FastAPI(docs_url=None,redoc_url=None,lifespan=lifespan,default_response_class=ORJSONResponse)
 origins=[
     "https://localhost:3000",
     "https://localhost:8000",
@@ -12,6 +46,14 @@ origins=[
     "http://localhost:8000",
     
 ]
+# innermost, so a profile covers routing, the handler and serialization
+if PROFILING_ENABLED and PROFILING_SECRET:
+    app.add_middleware(ProfilingMiddleware, secret=PROFILING_SECRET)
+# inside the rate limiter and CORS, so rejected clients are limited and can read the 413
+app.add_middleware(BodySizeLimitMiddleware)
+# added before CORS so CORS wraps it and 429s still carry the CORS headers
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=write_limiter)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -19,12 +61,77 @@ app.add_middleware(
     allow_methods=['*'],
     allow_headers=['*'],
 )
-app.mount("/v1/product-design",ui_ux_app)
-app.mount("/v1/web-design",web_designer_app)
-app.mount("/v1/mobile-dev",mobile_dev_app)
-app.mount("/v1/machine-learning",machine_learning_app)
-app.mount("/v1/backend-dev",backend_app)
+app.add_middleware(CompressionMiddleware)
+
+# URL prefix -> Mongo database of each portfolio
+PORTFOLIOS = {
+    "/v1/product-design": "ui_ux_portfolio",
+    "/v1/web-design": "web_design_portfolio",
+    "/v1/mobile-dev": "mobile_dev_portfolio",
+    "/v1/machine-learning": "machine_learning_portfolio",
+    "/v1/backend-dev": "backend_dev_portfolio",
+}
+for prefix, DB in PORTFOLIOS.items():
+    app.include_router(create_portfolio_router(DB), prefix=prefix)
+# outermost, so rate-limited and CORS-rejected requests are counted too
+app.add_middleware(MetricsMiddleware, mounts=tuple(PORTFOLIOS))
+
+@app.get("/v1/projects",tags=['Get Projects'])
+async def get_projects_across_portfolios(limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE), fields: Optional[str] = None):
+    """
+    returns the projects of every portfolio in one response, fetched concurrently
+
+    `limit` applies per portfolio, and `fields` works as on /get/projects
+    """
+    try:
+        # already JSON-ready, so skip jsonable_encoder
+        return ORJSONResponse(await get_projects_across_portfolios_func(limit=limit,fields=parse_fields(fields)))
+    except CircuitOpenError as e:
+        raise unavailable(e.retry_after)
+    except Exception as e:
+        raise HTTPException(status_code=500,detail=f"Couldn't get projects because {e}")
+
+@app.get("/v1/search",tags=['Get Projects'])
+async def search_projects(q: str = Query(..., min_length=1, max_length=200), limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE), offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET), fields: Optional[str] = None):
+    """
+    full-text search over the name and description of every portfolio's projects, best match first
+
+    page with `offset` (set to the previous `next_offset`) and `limit`; `fields` works as on /get/projects
+    """
+    try:
+        return ORJSONResponse(await search_projects_across_portfolios_func(query=q,limit=limit,offset=offset,fields=parse_fields(fields)))
+    except CircuitOpenError as e:
+        raise unavailable(e.retry_after)
+    except Exception as e:
+        raise HTTPException(status_code=500,detail=f"Couldn't search projects because {e}")
 
 @app.get("/")
 def home():
-    return {"deployed"}
\ No newline at end of file
+    return {"deployed"}
+
+
+@app.get("/ready")
+def ready(response: Response):
+    """
+    readiness probe: 200 once the Mongo pool is open, indexes exist and caches are primed, 503 until then
+    """
+    is_ready = getattr(app.state, "ready", False)
+    if not is_ready:
+        response.status_code = 503
+    return {"ready": is_ready}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    """
+    returns hit/miss counters for the project read cache
+    """
+    return project_cache.stats()
+
+
+@app.get("/metrics",response_class=PlainTextResponse)
+def metrics():
+    """
+    request, Mongo and cache metrics in the Prometheus text format
+    """
+    return PlainTextResponse(render_metrics(caches=(("project", project_cache), ("missing_project", missing_project_cache), ("search", search_cache), ("last_good", last_good_cache), ("database", database_cache))),media_type="text/plain; version=0.0.4")
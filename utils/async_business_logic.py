@@ -0,0 +1,496 @@
+"""
+Async variants of the functions in utils.business_logic.
+
+Each function has the same name, arguments and return value as its sync
+counterpart but awaits the shared AsyncMongoClient, so the FastAPI routes
+can be `async def` and keep many DB requests in flight on one worker.
+The sync module stays available for scripts and the shell. Search and
+the cross-portfolio reads only serve the /v1 routes, so they only exist
+here.
+
+Mongo calls go through utils.circuit_breaker.mongo_breaker, which fails
+them fast while Mongo is down; project reads fall back to the last result
+Mongo returned. Only the awaits that reach Mongo go through it, so cache
+hits and rejected arguments never count as Mongo answering.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from bson.objectid import ObjectId
+from utils.database import get_async_client
+from utils.business_logic import get_current_date, build_page_query, build_date_range_query, build_date_range_page_query, DATE_RANGE_SORT, build_project_bulk_requests, summarise_bulk_result, build_text_search_query, merge_search_results, ProjectDocument, PROJECT_PROJECTION
+from utils.encoding import encode_document
+from utils.cache import project_cache, database_cache, missing_project_cache, search_cache
+from utils.snapshot import SNAPSHOT_MODE, read_snapshot, refresh_snapshot, regenerate_snapshot, snapshot_page
+from utils.write_behind import CONTACT_WRITE_BEHIND, contact_message_queue
+from utils.circuit_breaker import CircuitOpenError, mongo_breaker, call_with_last_good
+
+logger = logging.getLogger(__name__)
+
+
+async def get_all_databases():
+    """
+    Retrieves a list of portfolio databases
+
+    Returns:
+        list: names of portfolio databases
+    """
+    list_of_portfolios = database_cache.get(("databases",))
+    if list_of_portfolios is not None:
+        return list_of_portfolios
+
+    async def fetch():
+        databases = await get_async_client().list_database_names()
+        return [db for db in databases if "portfolio" in db]
+
+    list_of_portfolios = await call_with_last_good(("databases",), fetch)
+    database_cache.set(("databases",), list_of_portfolios)
+    return list_of_portfolios
+
+
+async def _projects_changed(DB):
+    """
+    Drops DB's cached project reads after a write and, in snapshot mode,
+    regenerates its snapshot.
+    """
+    project_cache.invalidate(DB)
+    search_cache.invalidate(DB)
+    if SNAPSHOT_MODE:
+        # the write is committed by now; a failed regeneration only drops the snapshot
+        await asyncio.to_thread(refresh_snapshot, DB)
+
+
+async def _read_snapshot(DB):
+    """
+    Returns DB's snapshot, writing it first if it doesn't exist yet, or
+    None if it can't be written; callers then read from Mongo, which
+    serves the last good result while Mongo is down.
+
+    The regeneration goes through the breaker, so while Mongo is down a
+    missing snapshot fails at once instead of every read waiting for the
+    sync client's server selection timeout.
+    """
+    snapshot = read_snapshot(DB)
+    if snapshot is not None:
+        return snapshot
+    try:
+        await mongo_breaker.call(asyncio.to_thread, regenerate_snapshot, DB)
+    except CircuitOpenError:
+        return None
+    except Exception:
+        logger.exception("couldn't write the %s snapshot, reading from Mongo", DB)
+        return None
+    return read_snapshot(DB)
+
+
+async def get_all_projects_func(DB, limit=None, after=None, fields=None):
+    """
+    Retrieves all projects from the specified MongoDB database, ordered by _id.
+
+    Args:
+        DB (str): The name of the database.
+                  Must be one of: ('backend_dev_portfolio', 'machine_learning_portfolio',
+                                  'mobile_dev_portfolio', 'ui_ux_portfolio', 'web_design_portfolio')
+        limit (int, optional): Maximum number of projects to return.
+        after (str, optional): Id of the last project of the previous page.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
+
+    Returns:
+        list: A list of project documents retrieved from the database.
+              Each project is represented as a dictionary. While Mongo is
+              unavailable this is the last list it returned, if any.
+    """
+    _filter, projection = build_page_query(after, fields)
+    snapshot = await _read_snapshot(DB) if SNAPSHOT_MODE else None
+    if snapshot is not None:
+        return snapshot_page(snapshot, limit, after and str(_filter["_id"]["$gt"]), fields)
+    cache_key = (DB, "projects", limit, after, tuple(fields or ()))
+    projects = project_cache.get(cache_key)
+    if projects is not None:
+        return projects
+    generation = project_cache.generation(DB)
+
+    async def fetch():
+        cursor = get_async_client()[DB].project.find(_filter, projection).sort("_id", 1).limit(limit or 0)
+        return [encode_document(project) async for project in cursor]
+
+    projects = await call_with_last_good(cache_key, fetch)
+    project_cache.set(cache_key, projects, generation)
+    return projects
+
+
+async def get_projects_across_portfolios_func(limit=None, fields=None):
+    """
+    Retrieves the projects of every portfolio database concurrently.
+
+    The databases come from get_all_databases() and are queried with
+    asyncio.gather, so the total time is that of the slowest portfolio.
+    A portfolio that fails is reported in `errors` instead of failing the
+    whole call.
+
+    Args:
+        limit (int, optional): Maximum number of projects per portfolio.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
+
+    Returns:
+        dict:
+            - projects (list): Every project, tagged with its `portfolio` database name.
+            - errors (dict): Database name -> error message for portfolios that failed.
+    """
+    databases = await get_all_databases()
+    results = await asyncio.gather(
+        *(get_all_projects_func(DB, limit=limit, fields=fields) for DB in databases),
+        return_exceptions=True,
+    )
+    projects = []
+    errors = {}
+    for DB, result in zip(databases, results):
+        if isinstance(result, Exception):
+            errors[DB] = str(result)
+            continue
+        # copies, so the cached project dicts aren't modified
+        projects.extend({**project, "portfolio": DB} for project in result)
+    return {"projects": projects, "errors": errors}
+
+
+async def search_projects_func(DB, query, limit, fields=None):
+    """
+    Full-text searches the projects of one portfolio over `name` and
+    `description`, using the text index declared in utils.indexes.
+
+    Args:
+        DB (str): The name of the database.
+        query (str): The search terms.
+        limit (int): Maximum number of projects to return.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
+
+    Returns:
+        list: Matching projects, best match first, each with its relevance `score`.
+    """
+    _filter, projection, sort = build_text_search_query(query, fields)
+    cache_key = (DB, "search", query, limit, tuple(fields or ()))
+    projects = search_cache.get(cache_key)
+    if projects is not None:
+        return projects
+    generation = search_cache.generation(DB)
+
+    async def fetch():
+        cursor = get_async_client()[DB].project.find(_filter, projection).sort(sort).limit(limit)
+        return [encode_document(project) async for project in cursor]
+
+    projects = await mongo_breaker.call(fetch)
+    search_cache.set(cache_key, projects, generation)
+    return projects
+
+
+async def search_projects_across_portfolios_func(query, limit, offset=0, fields=None):
+    """
+    Full-text searches the projects of every portfolio database concurrently
+    and returns one page of the results ranked by relevance.
+
+    Each portfolio is asked for its best offset + limit matches, which is
+    enough to build the requested page of the merged ranking. A portfolio
+    that fails (e.g. its text index is missing) is reported in `errors`.
+
+    Args:
+        query (str): The search terms.
+        limit (int): Number of results per page.
+        offset (int): Number of results to skip.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
+
+    Returns:
+        dict:
+            - projects (list): The page, best match first, tagged with `portfolio` and `score`.
+            - next_offset (int | None): Offset of the next page, or None if this was the last one.
+            - errors (dict): Database name -> error message for portfolios that failed.
+    """
+    databases = await get_all_databases()
+    results = await asyncio.gather(
+        *(search_projects_func(DB, query, offset + limit + 1, fields=fields) for DB in databases),
+        return_exceptions=True,
+    )
+    found = {}
+    errors = {}
+    for DB, result in zip(databases, results):
+        if isinstance(result, Exception):
+            errors[DB] = str(result)
+        else:
+            found[DB] = result
+    # nothing cached and Mongo unavailable: a 503, not an empty result
+    if not found and results and all(isinstance(result, CircuitOpenError) for result in results):
+        raise results[0]
+    # one extra result per portfolio tells whether there is a next page
+    page = merge_search_results(found, offset, limit + 1)
+    next_offset = offset + limit if len(page) > limit else None
+    return {"projects": page[:limit], "next_offset": next_offset, "errors": errors}
+
+
+async def create_project_func(**kwargs):
+    """
+    Creates a new project entry in the specified MongoDB database.
+
+    Args:
+        DB (str): The name of the database.
+        project (dict): A dictionary containing project details, see
+                        utils.business_logic.create_project_func.
+
+    Returns:
+        dict: A dictionary containing the newly created project's ID:
+            - project_id (str): The MongoDB ObjectId of the inserted project.
+    """
+    cli = get_async_client()
+    project_collection = cli[kwargs["DB"]].project
+
+    project_data = kwargs.get("project")
+    if not project_data:
+        raise ValueError("Missing required argument: 'project'")
+
+    result = await mongo_breaker.call(project_collection.insert_one, project_data)
+    await _projects_changed(kwargs["DB"])
+    return {"project_id": str(result.inserted_id)}
+
+
+async def update_project_func(**kwargs):
+    """
+    Updates a single project entry in the specified MongoDB database.
+
+    Args:
+        DB (str): The name of the database.
+        project_id (str): The id of the document to be updated.
+        update_fields (dict): A dictionary containing the project fields to be updated.
+
+    Returns:
+        dict: A dictionary containing the number of Modified fields.
+    """
+    try:
+        _filter = {"_id": ObjectId(kwargs['project_id'])}
+    except Exception:
+        return {"error": "object Id exception"}
+
+    cli = get_async_client()
+    project_collection = cli[kwargs["DB"]].project
+    result = await mongo_breaker.call(project_collection.update_one, filter=_filter, update={"$set": kwargs["update_fields"]})
+    await _projects_changed(kwargs["DB"])
+    return {"Affected": result.modified_count}
+
+
+async def get_particular_project_func(DB, projectId: str) -> Optional[ProjectDocument]:
+    """
+    Retrieves a specific project from the MongoDB database by its ID.
+
+    Both found projects and ids that don't exist are cached, so repeated
+    lookups of either don't reach Mongo.
+
+    Args:
+        DB (str): The name of the database.
+        projectId (str): The ID of the project to retrieve (MongoDB ObjectId as a string).
+
+    Returns:
+        ProjectDocument | None: The project if found, otherwise None (also for ids that aren't valid ObjectIds).
+    """
+    try:
+        object_id = ObjectId(projectId)  # Convert string to ObjectId
+    except Exception:
+        return None
+
+    snapshot = await _read_snapshot(DB) if SNAPSHOT_MODE else None
+    if snapshot is not None:
+        project = snapshot["by_id"].get(str(object_id))
+        if project is None:
+            return None
+        return {key: project[key] for key in ("_id", *PROJECT_PROJECTION) if key in project}
+
+    cache_key = (DB, "project", projectId)
+    project = project_cache.get(cache_key)
+    if project is not None:
+        return project
+    if missing_project_cache.get(cache_key) is not None:
+        return None
+    generation = project_cache.generation(DB)
+
+    async def fetch():
+        project = await get_async_client()[DB].project.find_one({'_id': object_id}, PROJECT_PROJECTION)
+        return encode_document(project) if project is not None else None
+
+    project = await call_with_last_good(cache_key, fetch)
+    if project is None:
+        missing_project_cache.set(cache_key, True)
+        return None
+    project_cache.set(cache_key, project, generation)
+    return project
+
+
+async def delete_project_func(DB, projectId: str):
+    try:
+        object_id = ObjectId(projectId)
+    except Exception:
+        return {"error": "object Id exception"}
+
+    cli = get_async_client()
+    result = await mongo_breaker.call(cli[DB].project.delete_one, filter={"_id": object_id})
+    await _projects_changed(DB)
+    return {"Affected": result.deleted_count}
+
+
+async def bulk_write_projects_func(DB, operations, ordered=True):
+    """
+    Runs many project creates, updates and deletes as a single bulk_write.
+
+    Args:
+        DB (str): The name of the database.
+        operations (list): See utils.business_logic.build_project_bulk_requests.
+        ordered (bool): Stop at the first failing operation (True) or attempt all of them (False).
+
+    Returns:
+        dict: See utils.business_logic.summarise_bulk_result.
+    """
+    from pymongo.errors import BulkWriteError
+
+    requests, project_ids = build_project_bulk_requests(operations)
+    if not requests:
+        return summarise_bulk_result(operations, project_ids, ordered, {})
+    cli = get_async_client()
+    try:
+        result = await mongo_breaker.call(cli[DB].project.bulk_write, requests, ordered=ordered)
+        details = result.bulk_api_result
+    except BulkWriteError as e:
+        details = e.details
+    await _projects_changed(DB)
+    return summarise_bulk_result(operations, project_ids, ordered, details)
+
+
+async def delete_all_projects_func(DB):
+    """
+    Deletes every project in the specified database with one delete_many.
+
+    Returns:
+        dict: {"Affected": number of deleted projects}
+    """
+    cli = get_async_client()
+    result = await mongo_breaker.call(cli[DB].project.delete_many, {})
+    await _projects_changed(DB)
+    return {"Affected": result.deleted_count}
+
+
+async def delete_contact_func(DB, contact_id: str):
+    try:
+        object_id = ObjectId(contact_id)
+    except Exception:
+        return {"error": "object Id exception"}
+
+    cli = get_async_client()
+    result = await mongo_breaker.call(cli[DB].messages.delete_one, filter={"_id": object_id})
+    return {"Affected": result.deleted_count}
+
+
+async def get_all_contact_messages_func(DB, limit=None, after=None, fields=None):
+    """
+    Retrieves all Contact messages from the specified MongoDB database, ordered by _id.
+
+    Args:
+        DB (str): The name of the database.
+        limit (int, optional): Maximum number of messages to return.
+        after (str, optional): Id of the last message of the previous page.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
+
+    Returns:
+        list: A list of message documents retrieved from the database.
+    """
+    _filter, projection = build_page_query(after, fields)
+
+    async def fetch():
+        cursor = get_async_client()[DB].messages.find(_filter, projection).sort("_id", 1).limit(limit or 0)
+        return [encode_document(message) async for message in cursor]
+
+    return await mongo_breaker.call(fetch)
+
+
+def stream_contact_messages_func(DB, batch_size=500):
+    """
+    Iterates over every Contact message without loading them all into memory.
+
+    Args:
+        DB (str): The name of the database.
+        batch_size (int): Number of documents fetched from Mongo per round-trip.
+
+    Returns:
+        pymongo.asynchronous.cursor.AsyncCursor: An async cursor over the raw
+        message documents, ordered by _id.
+    """
+    cli = get_async_client()
+    return cli[DB].messages.find().sort("_id", 1).batch_size(batch_size)
+
+
+async def get_contact_messages_by_date_func(DB, start=None, end=None, limit=None, after=None):
+    """
+    Retrieves Contact messages created within a date range, oldest first.
+
+    Args:
+        DB (str): The name of the database.
+        start (datetime, optional): Lower bound (inclusive) on `createdAt`.
+        end (datetime, optional): Upper bound (exclusive) on `createdAt`.
+        limit (int, optional): Maximum number of messages to return.
+        after (str, optional): The `next_cursor` of the previous page.
+
+    Returns:
+        list: The matching message documents.
+    """
+    _filter = build_date_range_page_query(start, end, after)
+
+    async def fetch():
+        cursor = get_async_client()[DB].messages.find(_filter).sort(DATE_RANGE_SORT).limit(limit or 0)
+        return [encode_document(message) async for message in cursor]
+
+    return await mongo_breaker.call(fetch)
+
+
+async def purge_contact_messages_func(DB, start=None, end=None):
+    """
+    Deletes every Contact message created within a date range.
+
+    Args:
+        DB (str): The name of the database.
+        start (datetime, optional): Lower bound (inclusive) on `createdAt`.
+        end (datetime, optional): Upper bound (exclusive) on `createdAt`.
+
+    Returns:
+        dict: {"Affected": number of deleted messages}
+
+    Raises:
+        ValueError: If neither bound is given, to avoid wiping the whole inbox by accident.
+    """
+    if not start and not end:
+        raise ValueError("start or end is required")
+    cli = get_async_client()
+    result = await mongo_breaker.call(cli[DB].messages.delete_many, build_date_range_query(start, end))
+    return {"Affected": result.deleted_count}
+
+
+async def create_contact_message_func(**kwargs):
+    """
+    Creates a new Contact Message entry in the specified MongoDB database.
+
+    Args:
+        DB (str): The name of the database.
+        messages (dict): A dictionary containing the message details, see
+                         utils.business_logic.create_contact_message_func.
+
+    Returns:
+        dict: A dictionary containing the newly created message's ID:
+            - contact_id (str): The MongoDB ObjectId of the inserted message.
+    """
+    cli = get_async_client()
+    messages_collection = cli[kwargs["DB"]].messages
+
+    message_data = kwargs.get("messages")
+    if not message_data:
+        raise ValueError("Missing required argument: 'Messages'")
+    created_at = datetime.now(timezone.utc)
+    message_data['createdAt'] = created_at
+    message_data['currentDate'] = get_current_date(created_at)
+    if CONTACT_WRITE_BEHIND:
+        # acknowledged now, inserted by the background flush
+        return {"contact_id": str(contact_message_queue.enqueue(kwargs["DB"], message_data))}
+    result = await mongo_breaker.call(messages_collection.insert_one, message_data)
+    return {"contact_id": str(result.inserted_id)}
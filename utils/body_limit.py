@@ -0,0 +1,106 @@
+"""
+Request body size limits for the write endpoints.
+
+BodySizeLimitMiddleware picks a limit per route from BODY_LIMITS (or
+DEFAULT_BODY_LIMIT) and answers 413 as soon as a request is known to be
+over it: straight away when the Content-Length says so, otherwise as soon
+as the bytes received so far go over, so an oversized body is never
+buffered in full or handed to pydantic.
+"""
+import os
+import re
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+DEFAULT_BODY_LIMIT = int(os.getenv("DEFAULT_BODY_LIMIT", str(64 * 1024)))
+PROJECT_BODY_LIMIT = int(os.getenv("PROJECT_BODY_LIMIT", str(64 * 1024)))
+CONTACT_BODY_LIMIT = int(os.getenv("CONTACT_BODY_LIMIT", str(16 * 1024)))
+BULK_BODY_LIMIT = int(os.getenv("BULK_BODY_LIMIT", str(2 * 1024 * 1024)))
+
+# (method, pattern matched against the end of the path, limit in bytes)
+BODY_LIMITS = [
+    ("POST", re.compile(r"/create/project$"), PROJECT_BODY_LIMIT),
+    ("PATCH", re.compile(r"/update/project/[^/]+$"), PROJECT_BODY_LIMIT),
+    ("POST", re.compile(r"/create/contact$"), CONTACT_BODY_LIMIT),
+    ("POST", re.compile(r"/bulk/projects$"), BULK_BODY_LIMIT),
+]
+
+BODY_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+
+
+class BodyTooLarge(HTTPException):
+    """
+    Raised from receive() once a body goes over its limit. It is an
+    HTTPException so FastAPI passes it through its body parsing untouched
+    and the app's exception handler answers it with 413.
+    """
+
+    def __init__(self, limit):
+        super().__init__(status_code=413, detail=f"Request body is larger than the {limit} bytes allowed for this route")
+
+
+def body_limit(method, path, limits=BODY_LIMITS, default=DEFAULT_BODY_LIMIT):
+    """
+    Returns the body size limit in bytes for a request.
+    """
+    for limit_method, pattern, limit in limits:
+        if method == limit_method and pattern.search(path):
+            return limit
+    return default
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware rejecting request bodies over their route's limit with 413.
+    """
+
+    def __init__(self, app, limits=BODY_LIMITS, default=DEFAULT_BODY_LIMIT):
+        self.app = app
+        self.limits = limits
+        self.default = default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in BODY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        limit = body_limit(scope["method"], scope["path"], self.limits, self.default)
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                if value.isdigit() and int(value) > limit:
+                    await self._reject(scope, receive, send, limit)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def receive_with_limit():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise BodyTooLarge(limit)
+            return message
+
+        async def send_with_state(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_with_limit, send_with_state)
+        except BodyTooLarge:
+            if response_started:
+                raise
+            await self._reject(scope, receive, send, limit)
+
+    async def _reject(self, scope, receive, send, limit):
+        response = JSONResponse(
+            {"detail": BodyTooLarge(limit).detail},
+            status_code=413,
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -1,18 +1,31 @@
-from dotenv import load_dotenv
-import os
-import pprint
-import re
-import pymongo
-import json
-MONGO_URI = os.getenv("MONGO_URI")
+from typing import Optional, TypedDict
 from bson.objectid import ObjectId
+from utils.database import get_client
+from utils.encoding import encode_document
+from utils.cache import project_cache, database_cache, missing_project_cache, search_cache
+from utils.snapshot import SNAPSHOT_MODE, read_snapshot, refresh_snapshot, snapshot_page
 
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-def get_current_date():
+
+class ProjectDocument(TypedDict):
+    """
+    A project as returned by the single-project lookup.
+    """
+    _id: str
+    name: str
+    description: str
+    case_study_image_link: str
+    case_study_link: str
+
+
+# the fields of a ProjectDocument; _id is always returned
+PROJECT_PROJECTION = {"name": 1, "description": 1, "case_study_image_link": 1, "case_study_link": 1}
+
+def get_current_date(now=None):
     # Get the current date and time
-    now = datetime.now()
+    now = now or datetime.now()
     
     # Get the day of the month
     day = now.day
@@ -29,7 +42,146 @@ def get_current_date():
     return formatted_date
 
 
+def build_page_query(after=None, fields=None):
+    """
+    Builds the filter and projection for a keyset-paginated find() sorted by _id.
+
+    Args:
+        after (str, optional): Only return documents whose _id comes after this ObjectId.
+        fields (list, optional): Only return these fields (plus _id, which the cursor needs).
+
+    Returns:
+        tuple: (filter, projection) to pass to find().
+
+    Raises:
+        ValueError: If `after` is not a valid ObjectId.
+    """
+    _filter = {}
+    if after:
+        try:
+            _filter["_id"] = {"$gt": ObjectId(after)}
+        except Exception:
+            raise ValueError("object Id exception")
+    projection = {field: 1 for field in fields} if fields else None
+    return _filter, projection
+
+
+def build_text_search_query(query, fields=None):
+    """
+    Builds the filter, projection and sort for a $text search ranked by relevance.
+
+    Args:
+        query (str): The search terms, in MongoDB $text syntax ("quoted phrases", -excluded words).
+        fields (list, optional): Only return these fields (plus _id and score).
+
+    Returns:
+        tuple: (filter, projection, sort) to pass to find() and sort().
+    """
+    projection = {field: 1 for field in fields} if fields else {}
+    projection["score"] = {"$meta": "textScore"}
+    return {"$text": {"$search": query}}, projection, [("score", {"$meta": "textScore"})]
+
+
+def merge_search_results(results, offset, limit):
+    """
+    Merges the ranked search results of several portfolios into one page.
+
+    Args:
+        results (dict): Database name -> that portfolio's results, best first,
+                        each holding at least the best offset + limit matches.
+        offset (int): Number of results to skip.
+        limit (int): Number of results to return.
+
+    Returns:
+        list: The page, best score first, each result tagged with its `portfolio`.
+    """
+    merged = [{**project, "portfolio": DB} for DB, projects in results.items() for project in projects]
+    merged.sort(key=lambda project: (-project["score"], project["portfolio"], project["_id"]))
+    return merged[offset:offset + limit]
+
+
+def get_next_cursor(documents, limit):
+    """
+    Returns the cursor for the page after `documents`, or None if this was the last page.
+    """
+    if limit and len(documents) == limit:
+        return documents[-1]["_id"]
+    return None
+
 
+def build_date_range_query(start=None, end=None):
+    """
+    Builds a filter on the indexed `createdAt` field of contact messages.
+
+    Args:
+        start (datetime, optional): Include messages created at or after this time.
+        end (datetime, optional): Include messages created before this time.
+                                  Naive datetimes are treated as UTC.
+
+    Returns:
+        dict: The filter to pass to find() or delete_many().
+    """
+    date_range = {}
+    if start:
+        date_range["$gte"] = start
+    if end:
+        date_range["$lt"] = end
+    return {"createdAt": date_range} if date_range else {}
+
+
+def build_date_range_page_query(start=None, end=None, after=None):
+    """
+    Builds the filter for one page of a date range, sorted by
+    (createdAt, _id) so messages created in the same millisecond still
+    page in a stable order. Messages without `createdAt` are left out.
+
+    Args:
+        start (datetime, optional): Include messages created at or after this time.
+        end (datetime, optional): Include messages created before this time.
+        after (str, optional): The `next_cursor` of the previous page.
+
+    Returns:
+        dict: The filter to pass to find(), sorted by DATE_RANGE_SORT.
+
+    Raises:
+        ValueError: If `after` is not a cursor from get_date_range_cursor().
+    """
+    _filter = build_date_range_query(start, end) or {"createdAt": {"$exists": True}}
+    if not after:
+        return _filter
+    milliseconds, _, message_id = after.partition("_")
+    try:
+        created_at = _EPOCH + timedelta(milliseconds=int(milliseconds))
+        message_id = ObjectId(message_id)
+    except Exception:
+        raise ValueError("not a date range cursor")
+    return {"$and": [_filter, {"$or": [
+        {"createdAt": {"$gt": created_at}},
+        {"createdAt": created_at, "_id": {"$gt": message_id}},
+    ]}]}
+
+
+DATE_RANGE_SORT = [("createdAt", 1), ("_id", 1)]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def get_date_range_cursor(messages, limit):
+    """
+    Returns the cursor for the page of a date range after `messages`, or
+    None if this was the last page.
+
+    The cursor is `<createdAt in epoch milliseconds>_<_id>`: Mongo stores
+    dates to the millisecond, so it is exact, and unlike an ISO 8601 offset
+    it has no `+` to get mangled in a query string.
+    """
+    if not limit or len(messages) < limit:
+        return None
+    created_at = datetime.fromisoformat(messages[-1]["createdAt"])
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    milliseconds = (created_at - _EPOCH) // timedelta(milliseconds=1)
+    return f"{milliseconds}_{messages[-1]['_id']}"
 
 
 def get_all_databases():
@@ -39,44 +191,75 @@ def get_all_databases():
     Returns:
         list: names of portfolio databases 
     """
+    list_of_portfolios = database_cache.get(("databases",))
+    if list_of_portfolios is not None:
+        return list_of_portfolios
     list_of_portfolios=[]
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        databases = cli.list_database_names()
-        for db in databases:
-            if "portfolio" in db:
-                list_of_portfolios.append(db)
+    cli = get_client()
+    databases = cli.list_database_names()
+    for db in databases:
+        if "portfolio" in db:
+            list_of_portfolios.append(db)
+    database_cache.set(("databases",), list_of_portfolios)
     return list_of_portfolios
     
     
-def get_all_projects_func(DB):
+def _projects_changed(DB):
+    """
+    Drops DB's cached project reads after a write and, in snapshot mode,
+    regenerates its snapshot.
+    """
+    project_cache.invalidate(DB)
+    search_cache.invalidate(DB)
+    if SNAPSHOT_MODE:
+        # the write is committed by now; a failed regeneration only drops the snapshot
+        refresh_snapshot(DB)
+
+
+def _read_snapshot(DB):
     """
-    Retrieves all projects from the specified MongoDB database.
+    Returns DB's snapshot, writing it first if it doesn't exist yet, or
+    None if it can't be written; callers then read from Mongo.
+    """
+    snapshot = read_snapshot(DB)
+    if snapshot is None and refresh_snapshot(DB):
+        snapshot = read_snapshot(DB)
+    return snapshot
+
+
+def get_all_projects_func(DB, limit=None, after=None, fields=None):
+    """
+    Retrieves all projects from the specified MongoDB database, ordered by _id.
 
     Args:
         DB (str): The name of the database.
                   Must be one of: ('backend_dev_portfolio', 'machine_learning_portfolio', 
                                   'mobile_dev_portfolio', 'ui_ux_portfolio', 'web_design_portfolio')
+        limit (int, optional): Maximum number of projects to return.
+        after (str, optional): Id of the last project of the previous page.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
 
     Returns:
         list: A list of project documents retrieved from the database.
               Each project is represented as a dictionary.
     """
-    cleaned_data = []
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[DB]
-        project_collection = db.project
-        project_list =[str(projectlist) for projectlist in project_collection.find()]
-        for item in project_list:
-            # Replace ObjectId with just the string value
-            item = re.sub(r"ObjectId\('([a-f0-9]{24})'\)", r'"\1"', item)
-            
-            # Replace single quotes with double quotes
-            item = item.replace("'", '"')
-            item = item.replace('\"s', "'s")
-            cleaned_data.append(item)
-        
-        return cleaned_data 
-      
+    _filter, projection = build_page_query(after, fields)
+    snapshot = _read_snapshot(DB) if SNAPSHOT_MODE else None
+    if snapshot is not None:
+        return snapshot_page(snapshot, limit, after and str(_filter["_id"]["$gt"]), fields)
+    cache_key = (DB, "projects", limit, after, tuple(fields or ()))
+    projects = project_cache.get(cache_key)
+    if projects is not None:
+        return projects
+    generation = project_cache.generation(DB)
+    cli = get_client()
+    db = cli[DB]
+    project_collection = db.project
+    cursor = project_collection.find(_filter, projection).sort("_id", 1).limit(limit or 0)
+    projects = [encode_document(project) for project in cursor]
+    project_cache.set(cache_key, projects, generation)
+    return projects
+
 
 def create_project_func(**kwargs):
     """
@@ -96,16 +279,17 @@ def create_project_func(**kwargs):
         dict: A dictionary containing the newly created project's ID:
             - project_id (str): The MongoDB ObjectId of the inserted project.
     """
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[kwargs["DB"]]
-        project_collection = db.project
-        
-        project_data = kwargs.get("project")
-        if not project_data:
-            raise ValueError("Missing required argument: 'project'")
+    cli = get_client()
+    db = cli[kwargs["DB"]]
+    project_collection = db.project
+    
+    project_data = kwargs.get("project")
+    if not project_data:
+        raise ValueError("Missing required argument: 'project'")
 
-        new_document_id = project_collection.insert_one(project_data).inserted_id
-        return {"project_id": str(new_document_id)}  # Convert ObjectId to string for JSON compatibility
+    new_document_id = project_collection.insert_one(project_data).inserted_id
+    _projects_changed(kwargs["DB"])
+    return {"project_id": str(new_document_id)}  # Convert ObjectId to string for JSON compatibility
 
 def update_project_func(**kwargs):
     """
@@ -132,17 +316,21 @@ def update_project_func(**kwargs):
     except Exception:
             return {"error":"object Id exception"}
     
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[kwargs["DB"]]
-        project_collection = db.project
-        acknowledged=project_collection.update_one(filter=_filter,update={"$set":kwargs["update_fields"]}).modified_count
-        return {"Affected":acknowledged}
+    cli = get_client()
+    db = cli[kwargs["DB"]]
+    project_collection = db.project
+    acknowledged=project_collection.update_one(filter=_filter,update={"$set":kwargs["update_fields"]}).modified_count
+    _projects_changed(kwargs["DB"])
+    return {"Affected":acknowledged}
 
 
-def get_particular_project_func(DB, projectId: str):
+def get_particular_project_func(DB, projectId: str) -> Optional[ProjectDocument]:
     """
     Retrieves a specific project from the MongoDB database by its ID.
 
+    Both found projects and ids that don't exist are cached, so repeated
+    lookups of either don't reach Mongo.
+
     Args:
         DB (str): The name of the database.
                   Must be one of: ('backend_dev_portfolio', 'machine_learning_portfolio', 
@@ -150,32 +338,35 @@ def get_particular_project_func(DB, projectId: str):
         projectId (str): The ID of the project to retrieve (MongoDB ObjectId as a string).
 
     Returns:
-        dict | None: The project document if found, otherwise None.
+        ProjectDocument | None: The project if found, otherwise None (also for ids that aren't valid ObjectIds).
     """
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[DB]
-        project_collection = db.project
-
-        try:
-            object_id = ObjectId(projectId)  # Convert string to ObjectId
-        except Exception:
-            return {"error":"object Id exception"}
-
-        project = project_collection.find_one({'_id': object_id})
-        cleaned_data =[]
-        s = {}
-        
-        print(type(project))
-        for item in project:
-            # Replace ObjectId with just the string value
-            item = re.sub(r"ObjectId\('([a-f0-9]{24})'\)", r'"\1"', item)
-            
-            # Replace single quotes with double quotes
-            item = item.replace("'", '"')
-            item = item.replace('\"s', "'s")
-            cleaned_data.append(str(project.get(item)))
-        
-        return cleaned_data 
+    try:
+        object_id = ObjectId(projectId)  # Convert string to ObjectId
+    except Exception:
+        return None
+
+    snapshot = _read_snapshot(DB) if SNAPSHOT_MODE else None
+    if snapshot is not None:
+        project = snapshot["by_id"].get(str(object_id))
+        if project is None:
+            return None
+        return {key: project[key] for key in ("_id", *PROJECT_PROJECTION) if key in project}
+
+    cache_key = (DB, "project", projectId)
+    project = project_cache.get(cache_key)
+    if project is not None:
+        return project
+    if missing_project_cache.get(cache_key) is not None:
+        return None
+    generation = project_cache.generation(DB)
+
+    project = get_client()[DB].project.find_one({'_id': object_id}, PROJECT_PROJECTION)
+    if project is None:
+        missing_project_cache.set(cache_key, True)
+        return None
+    project = encode_document(project)
+    project_cache.set(cache_key, project, generation)
+    return project
 
 
 def delete_project_func(DB,projectId:str):
@@ -185,14 +376,135 @@ def delete_project_func(DB,projectId:str):
         return {"error":"object Id exception"}
     _filter = {"_id":object_id}
     
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[DB]
-        project_collection = db.project
-        delete_count = project_collection.delete_one(filter=_filter).deleted_count
-        return {"Affected":delete_count}    
+    cli = get_client()
+    db = cli[DB]
+    project_collection = db.project
+    delete_count = project_collection.delete_one(filter=_filter).deleted_count
+    _projects_changed(DB)
+    return {"Affected":delete_count}    
+
+
+
+def build_project_bulk_requests(operations):
+    """
+    Turns a list of project operations into PyMongo bulk_write requests.
+
+    Args:
+        operations (list): Each item is a dict with:
+            - op (str): One of "create", "update" or "delete".
+            - project_id (str): Id of the project to update or delete.
+            - project (dict): Fields to insert on create, or to $set on update.
+
+    Returns:
+        tuple: (requests, project_ids), where project_ids[i] is the id the
+               i-th operation touches. Ids for creates are generated here so
+               they can be reported even though bulk_write doesn't return them.
+
+    Raises:
+        ValueError: If an operation is unknown, lacks a project, or has an invalid id.
+    """
+    import pymongo
+
+    requests = []
+    project_ids = []
+    for index, operation in enumerate(operations):
+        op = operation.get("op")
+        project = operation.get("project")
+        if op == "create":
+            if not project:
+                raise ValueError(f"operation {index}: missing project")
+            object_id = ObjectId()
+            requests.append(pymongo.InsertOne({**project, "_id": object_id}))
+        elif op in ("update", "delete"):
+            try:
+                object_id = ObjectId(operation.get("project_id"))
+            except Exception:
+                raise ValueError(f"operation {index}: object Id exception")
+            if op == "update":
+                if not project:
+                    raise ValueError(f"operation {index}: missing project")
+                requests.append(pymongo.UpdateOne({"_id": object_id}, {"$set": project}))
+            else:
+                requests.append(pymongo.DeleteOne({"_id": object_id}))
+        else:
+            raise ValueError(f"operation {index}: unknown op {op!r}")
+        project_ids.append(str(object_id))
+    return requests, project_ids
+
+
+def summarise_bulk_result(operations, project_ids, ordered, details):
+    """
+    Builds the per-item report for a bulk_write.
+
+    Args:
+        operations (list): The operations passed to build_project_bulk_requests.
+        project_ids (list): The ids it returned.
+        ordered (bool): Whether the bulk_write stopped at the first error.
+        details (dict): BulkWriteResult.bulk_api_result, or BulkWriteError.details.
+
+    Returns:
+        dict: Totals (inserted, matched, modified, deleted) and a `results`
+              list with the status ("ok", "error" or "skipped") of every item.
+    """
+    errors = {error["index"]: error.get("errmsg", "write error") for error in details.get("writeErrors", [])}
+    first_error = min(errors) if errors else None
+    results = []
+    for index, operation in enumerate(operations):
+        item = {"index": index, "op": operation.get("op"), "project_id": project_ids[index], "status": "ok"}
+        if index in errors:
+            item["status"] = "error"
+            item["error"] = errors[index]
+        elif ordered and first_error is not None and index > first_error:
+            item["status"] = "skipped"
+        results.append(item)
+    return {
+        "inserted": details.get("nInserted", 0),
+        "matched": details.get("nMatched", 0),
+        "modified": details.get("nModified", 0),
+        "deleted": details.get("nRemoved", 0),
+        "results": results,
+    }
+
+
+def bulk_write_projects_func(DB, operations, ordered=True):
+    """
+    Runs many project creates, updates and deletes as a single bulk_write.
+
+    Args:
+        DB (str): The name of the database.
+        operations (list): See build_project_bulk_requests.
+        ordered (bool): Stop at the first failing operation (True) or attempt all of them (False).
+
+    Returns:
+        dict: See summarise_bulk_result.
+    """
+    from pymongo.errors import BulkWriteError
+
+    requests, project_ids = build_project_bulk_requests(operations)
+    if not requests:
+        return summarise_bulk_result(operations, project_ids, ordered, {})
+    cli = get_client()
+    try:
+        details = cli[DB].project.bulk_write(requests, ordered=ordered).bulk_api_result
+    except BulkWriteError as e:
+        details = e.details
+    _projects_changed(DB)
+    return summarise_bulk_result(operations, project_ids, ordered, details)
+
+
+def delete_all_projects_func(DB):
+    """
+    Deletes every project in the specified database with one delete_many.
+
+    Returns:
+        dict: {"Affected": number of deleted projects}
+    """
+    cli = get_client()
+    delete_count = cli[DB].project.delete_many({}).deleted_count
+    _projects_changed(DB)
+    return {"Affected":delete_count}
+
 
-    
- 
 def delete_contact_func(DB,contact_id:str):
     try:
         object_id = ObjectId(contact_id) 
@@ -200,42 +512,116 @@ def delete_contact_func(DB,contact_id:str):
         return {"error":"object Id exception"}
     _filter = {"_id":object_id}
     
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[DB]
-        project_collection = db.messages
-        delete_count = project_collection.delete_one(filter=_filter).deleted_count
-        return {"Affected":delete_count}    
+    cli = get_client()
+    db = cli[DB]
+    project_collection = db.messages
+    delete_count = project_collection.delete_one(filter=_filter).deleted_count
+    return {"Affected":delete_count}    
 
-   
 
 
 
-def get_all_contact_messages_func(DB):
+
+def get_all_contact_messages_func(DB, limit=None, after=None, fields=None):
     """
-    Retrieves all Contact messages from the specified MongoDB database.
+    Retrieves all Contact messages from the specified MongoDB database, ordered by _id.
 
     Args:
         DB (str): The name of the database.
                   Must be one of: ('backend_dev_portfolio', 'machine_learning_portfolio', 
                                   'mobile_dev_portfolio', 'ui_ux_portfolio', 'web_design_portfolio')
+        limit (int, optional): Maximum number of messages to return.
+        after (str, optional): Id of the last message of the previous page.
+        fields (list, optional): Names of the fields to return; all fields when omitted.
 
     Returns:
-        list: A list of project documents retrieved from the database.
-              Each project is represented as a dictionary.
+        list: A list of message documents retrieved from the database.
+              Each message is represented as a dictionary.
     """
-    cleaned_data = []
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[DB]
-        project_collection = db.messages
-        project_list =[str(projectlist) for projectlist in project_collection.find()]
-        for item in project_list:
-            # Replace ObjectId with just the string value
-            item = re.sub(r"ObjectId\('([a-f0-9]{24})'\)", r'"\1"', item)
+    _filter, projection = build_page_query(after, fields)
+    cli = get_client()
+    db = cli[DB]
+    project_collection = db.messages
+    cursor = project_collection.find(_filter, projection).sort("_id", 1).limit(limit or 0)
+    return [encode_document(message) for message in cursor]
+
+
+def stream_contact_messages_func(DB, batch_size=500):
+    """
+    Iterates over every Contact message without loading them all into memory.
+
+    Args:
+        DB (str): The name of the database.
+        batch_size (int): Number of documents fetched from Mongo per round-trip.
+
+    Returns:
+        pymongo.cursor.Cursor: A cursor over the raw message documents, ordered by _id.
+    """
+    cli = get_client()
+    return cli[DB].messages.find().sort("_id", 1).batch_size(batch_size)
+
+
+def get_contact_messages_by_date_func(DB, start=None, end=None, limit=None, after=None):
+    """
+    Retrieves Contact messages created within a date range, oldest first.
+
+    Args:
+        DB (str): The name of the database.
+        start (datetime, optional): Lower bound (inclusive) on `createdAt`.
+        end (datetime, optional): Upper bound (exclusive) on `createdAt`.
+        limit (int, optional): Maximum number of messages to return.
+        after (str, optional): The `next_cursor` of the previous page.
+
+    Returns:
+        list: The matching message documents.
+    """
+    cli = get_client()
+    cursor = cli[DB].messages.find(build_date_range_page_query(start, end, after)).sort(DATE_RANGE_SORT).limit(limit or 0)
+    return [encode_document(message) for message in cursor]
+
+
+def purge_contact_messages_func(DB, start=None, end=None):
+    """
+    Deletes every Contact message created within a date range.
+
+    Args:
+        DB (str): The name of the database.
+        start (datetime, optional): Lower bound (inclusive) on `createdAt`.
+        end (datetime, optional): Upper bound (exclusive) on `createdAt`.
+
+    Returns:
+        dict: {"Affected": number of deleted messages}
+
+    Raises:
+        ValueError: If neither bound is given, to avoid wiping the whole inbox by accident.
+    """
+    if not start and not end:
+        raise ValueError("start or end is required")
+    cli = get_client()
+    delete_count = cli[DB].messages.delete_many(build_date_range_query(start, end)).deleted_count
+    return {"Affected":delete_count}
+
+
+def backfill_message_timestamps_func(DB):
+    """
+    Sets `createdAt` on messages stored before it existed, using the
+    creation time embedded in each message's ObjectId.
+
+    Returns:
+        dict: {"Affected": number of updated messages}
+    """
+    import pymongo
+
+    cli = get_client()
+    messages_collection = cli[DB].messages
+    requests = [
+        pymongo.UpdateOne({"_id": message["_id"]}, {"$set": {"createdAt": message["_id"].generation_time}})
+        for message in messages_collection.find({"createdAt": {"$exists": False}}, {"_id": 1})
+    ]
+    if not requests:
+        return {"Affected":0}
+    return {"Affected":messages_collection.bulk_write(requests, ordered=False).modified_count}
 
-            cleaned_data.append(item)
-        
-        return cleaned_data
-      
 
 
 
@@ -254,19 +640,21 @@ def create_contact_message_func(**kwargs):
             - subject (str): Subject of message user wants to send.
             - message (str): Message user wants to send.
             - emailAddress (str): email Address of the user
+                  `createdAt` (UTC datetime) and its display form `currentDate` are added here.
 
     Returns:
         dict: A dictionary containing the newly created project's ID:
             - project_id (str): The MongoDB ObjectId of the inserted project.
     """
-    with pymongo.MongoClient(MONGO_URI) as cli:
-        db = cli[kwargs["DB"]]
-        project_collection = db.messages
-        
-        project_data = kwargs.get("messages")
-        if not project_data:
-            raise ValueError("Missing required argument: 'Messages'")
-        print(project_data,type(project_data))
-        project_data['currentDate']= get_current_date()
-        new_document_id = project_collection.insert_one(project_data).inserted_id
-        return {"contact_id": str(new_document_id)}  # Convert ObjectId to string for JSON compatibility
+    cli = get_client()
+    db = cli[kwargs["DB"]]
+    project_collection = db.messages
+    
+    project_data = kwargs.get("messages")
+    if not project_data:
+        raise ValueError("Missing required argument: 'Messages'")
+    created_at = datetime.now(timezone.utc)
+    project_data['createdAt']= created_at
+    project_data['currentDate']= get_current_date(created_at)
+    new_document_id = project_collection.insert_one(project_data).inserted_id
+    return {"contact_id": str(new_document_id)}  # Convert ObjectId to string for JSON compatibility
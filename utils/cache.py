@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PROJECT_CACHE_MAXSIZE = int(os.getenv("PROJECT_CACHE_MAXSIZE", "256"))
+PROJECT_CACHE_TTL = float(os.getenv("PROJECT_CACHE_TTL", "300"))
+DATABASE_LIST_TTL = float(os.getenv("DATABASE_LIST_TTL", "600"))
+MISSING_PROJECT_CACHE_MAXSIZE = int(os.getenv("MISSING_PROJECT_CACHE_MAXSIZE", "1024"))
+MISSING_PROJECT_CACHE_TTL = float(os.getenv("MISSING_PROJECT_CACHE_TTL", "60"))
+SEARCH_CACHE_MAXSIZE = int(os.getenv("SEARCH_CACHE_MAXSIZE", "256"))
+LAST_GOOD_TTL = float(os.getenv("LAST_GOOD_TTL", "86400"))
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A small bounded LRU cache whose entries also expire after `ttl` seconds.
+
+    Keys are tuples whose first item is the portfolio database name, so
+    every entry belonging to one portfolio can be dropped with
+    invalidate(DB) after a write.
+
+    A read that misses and then awaits Mongo can race a write: the write
+    invalidates while the read is in flight, and the read then caches what
+    it fetched before the write. To avoid that, take generation(DB) before
+    fetching and pass it to set(), which drops the value if DB was
+    invalidated in between.
+
+    The cache lives in process memory: with several uvicorn workers each one
+    holds its own copy, and the TTL bounds how long a worker that did not
+    see a write can serve the old value.
+    """
+
+    def __init__(self, maxsize=256, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._generations = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for `key`, or `default` if it is missing
+        or expired. Counts a hit or a miss.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def generation(self, DB):
+        """
+        Returns:
+            tuple: A token that changes whenever invalidate() drops DB's
+                   entries (including invalidate() of everything).
+        """
+        with self._lock:
+            return (self._generation, self._generations.get(DB, 0))
+
+    def set(self, key, value, generation=None):
+        """
+        Stores `value` under `key`, evicting the least recently used entry
+        when the cache is full.
+
+        Args:
+            generation (tuple, optional): generation(key[0]) from before the
+                value was fetched; the value isn't stored if the portfolio
+                was invalidated since.
+        """
+        with self._lock:
+            if generation is not None and generation != (self._generation, self._generations.get(key[0], 0)):
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, DB=None):
+        """
+        Drops every entry for the portfolio database `DB`, or everything
+        when DB is None.
+        """
+        with self._lock:
+            if DB is None:
+                self._generation += 1
+                self._data.clear()
+                return
+            self._generations[DB] = self._generations.get(DB, 0) + 1
+            for key in [key for key in self._data if key[0] == DB]:
+                del self._data[key]
+
+    def stats(self):
+        """
+        Returns:
+            dict: hit and miss counters plus the current and maximum size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+# Read cache for project lists and single projects, shared by the sync and
+# async business layers.
+project_cache = TTLCache(maxsize=PROJECT_CACHE_MAXSIZE, ttl=PROJECT_CACHE_TTL)
+
+# Project ids that were looked up and not found, kept apart from
+# project_cache so probes with made-up ids can't evict real projects.
+# Project ids are always generated server-side, so an id that misses now
+# won't start existing later; the TTL only bounds how long the entry lingers.
+missing_project_cache = TTLCache(maxsize=MISSING_PROJECT_CACHE_MAXSIZE, ttl=MISSING_PROJECT_CACHE_TTL)
+
+# Search results, kept apart from project_cache for the same reason: any
+# query string makes a new entry, so searches mustn't evict project lists.
+# Invalidated with project_cache on every project write.
+search_cache = TTLCache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=PROJECT_CACHE_TTL)
+
+# The last project reads answered by Mongo, served by
+# utils.circuit_breaker while Mongo is unavailable. Not invalidated by
+# writes: stale data is the point.
+last_good_cache = TTLCache(maxsize=PROJECT_CACHE_MAXSIZE, ttl=LAST_GOOD_TTL)
+
+# Names of the portfolio databases, so discovery doesn't cost a
+# list_database_names() round-trip on every request.
+database_cache = TTLCache(maxsize=1, ttl=DATABASE_LIST_TTL)
@@ -0,0 +1,177 @@
+"""
+Circuit breaker around the async business layer's Mongo calls.
+
+After MONGO_BREAKER_THRESHOLD consecutive calls fail because Mongo can't
+be reached, the breaker opens: for MONGO_BREAKER_RESET_TIMEOUT seconds
+every call fails at once with CircuitOpenError instead of waiting for the
+server selection timeout, and the routes answer 503 with Retry-After.
+After that one call is let through as a probe; if it succeeds the breaker
+closes, otherwise it opens again.
+
+Project reads don't fail while the breaker is open, as long as they were
+answered once before: call_with_last_good() keeps the last result of each
+read and serves it when Mongo is unavailable, so the public portfolio
+stays up.
+
+The breaker state is per process.
+"""
+import math
+import os
+import time
+from contextvars import ContextVar
+from fastapi import HTTPException
+from utils.cache import last_good_cache
+
+MONGO_BREAKER_THRESHOLD = int(os.getenv("MONGO_BREAKER_THRESHOLD", "5"))
+MONGO_BREAKER_RESET_TIMEOUT = float(os.getenv("MONGO_BREAKER_RESET_TIMEOUT", "30"))
+
+# set when the current request was answered from last_good_cache
+serving_stale = ContextVar("serving_stale", default=False)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling Mongo while the breaker is open, and by
+    call_with_last_good() when Mongo is unreachable and there is nothing
+    stale to serve. Routes turn it into a 503.
+    """
+
+    def __init__(self, retry_after):
+        super().__init__("Mongo is unavailable")
+        self.retry_after = retry_after
+
+
+def is_outage(error):
+    """
+    Whether `error` means Mongo couldn't be reached (as opposed to, say, a
+    bad query), which is what the breaker counts.
+    """
+    from pymongo.errors import ConnectionFailure
+
+    return isinstance(error, (ConnectionFailure, CircuitOpenError))
+
+
+def is_mongo_answer(error):
+    """
+    Whether `error` came back from Mongo, e.g. a duplicate key or a bad
+    query, which shows Mongo is reachable.
+    """
+    from pymongo.errors import PyMongoError
+
+    return isinstance(error, PyMongoError) and not is_outage(error)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=MONGO_BREAKER_THRESHOLD, reset_timeout=MONGO_BREAKER_RESET_TIMEOUT):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout or self._probing:
+            return "open"
+        return "half-open"
+
+    def retry_after(self):
+        """
+        Returns:
+            float: Seconds until the breaker lets a probe through.
+        """
+        if self.opened_at is None:
+            return 0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError unless a call may go ahead.
+        """
+        state = self.state
+        if state == "open":
+            raise CircuitOpenError(self.retry_after() or 1)
+        if state == "half-open":
+            self._probing = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    async def call(self, function, *args, **kwargs):
+        """
+        Awaits function(*args, **kwargs) through the breaker. Only wrap the
+        awaits that reach Mongo: whatever returns counts as Mongo answering.
+        """
+        self.before_call()
+        try:
+            result = await function(*args, **kwargs)
+        except BaseException as error:
+            if is_outage(error):
+                self.record_failure()
+            elif is_mongo_answer(error):
+                # Mongo answered, it just didn't like the request
+                self.record_success()
+            else:
+                # cancelled, or our own bug: says nothing about Mongo, but a
+                # probe must let the next one through
+                self._probing = False
+            raise
+        self.record_success()
+        return result
+
+
+mongo_breaker = CircuitBreaker()
+
+
+async def call_with_last_good(key, fetch):
+    """
+    Awaits fetch() through the breaker and remembers the result under
+    `key`. When Mongo is unavailable, returns the last result remembered
+    under `key` instead and sets `serving_stale`; with nothing remembered
+    it raises CircuitOpenError.
+    """
+    try:
+        result = await mongo_breaker.call(fetch)
+    except Exception as error:
+        if not is_outage(error):
+            raise
+        stale = last_good_cache.get(key)
+        if stale is None:
+            if isinstance(error, CircuitOpenError):
+                raise
+            raise CircuitOpenError(mongo_breaker.retry_after() or 1) from error
+        serving_stale.set(True)
+        return stale
+    if result is not None:
+        last_good_cache.set(key, result)
+    return result
+
+
+def unavailable(retry_after):
+    """
+    Returns the 503 sent while Mongo is unavailable.
+    """
+    return HTTPException(
+        status_code=503,
+        detail="The database is unavailable, try again shortly",
+        headers={"Retry-After": str(math.ceil(retry_after) or 1)},
+    )
+
+
+async def require_closed_circuit():
+    """
+    FastAPI dependency failing a request with 503 straight away while the
+    breaker is open.
+    """
+    if mongo_breaker.state == "open":
+        raise unavailable(mongo_breaker.retry_after())
@@ -0,0 +1,175 @@
+"""
+gzip and brotli compression of response bodies.
+
+CompressionMiddleware compresses JSON, NDJSON and text responses of at
+least COMPRESSION_MIN_SIZE bytes with the best encoding the client accepts
+(brotli when the `brotli` package is installed, otherwise gzip). Streaming
+responses such as /export/messages are compressed chunk by chunk and
+flushed after every chunk, so they keep streaming.
+
+The cacheable project responses are compressed ahead of the middleware by
+conditional_json_response(), at a higher level, through
+compress_cached(): the result is kept per ETag and encoding so the same
+body is only compressed once however many clients ask for it.
+"""
+import os
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from utils.cache import TTLCache, PROJECT_CACHE_TTL
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# levels for bodies compressed on every request
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# levels for cached bodies, where the extra CPU is paid once per ETag
+CACHED_GZIP_LEVEL = int(os.getenv("CACHED_GZIP_LEVEL", "9"))
+CACHED_BROTLI_QUALITY = int(os.getenv("CACHED_BROTLI_QUALITY", "11"))
+COMPRESSED_CACHE_MAXSIZE = int(os.getenv("COMPRESSED_CACHE_MAXSIZE", "128"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# (etag, encoding) -> compressed body; ETags are content hashes, so entries
+# never go stale and only need to age out.
+compressed_body_cache = TTLCache(maxsize=COMPRESSED_CACHE_MAXSIZE, ttl=PROJECT_CACHE_TTL)
+
+
+def choose_encoding(accept_encoding):
+    """
+    Picks the response encoding from an Accept-Encoding header.
+
+    Returns:
+        str: "br", "gzip", or None when the client accepts neither.
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body, encoding, cached=False):
+    """
+    Compresses a whole body with `encoding` ("br" or "gzip").
+
+    Args:
+        cached (bool): Use the slower, stronger levels meant for bodies
+                       that are compressed once and served many times.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=CACHED_BROTLI_QUALITY if cached else BROTLI_QUALITY)
+    compressor = zlib.compressobj(CACHED_GZIP_LEVEL if cached else GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def compress_cached(etag, body, encoding):
+    """
+    Returns `body` compressed with `encoding`, reusing the result of an
+    earlier call with the same ETag.
+    """
+    key = (etag, encoding)
+    compressed = compressed_body_cache.get(key)
+    if compressed is None:
+        compressed = compress(body, encoding, cached=True)
+        compressed_body_cache.set(key, compressed)
+    return compressed
+
+
+class _StreamCompressor:
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        self.encoding = encoding
+
+    def compress(self, chunk, last):
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + (self._compressor.finish() if last else self._compressor.flush())
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses the client accepts compressed.
+
+    Responses that already carry a Content-Encoding (the pre-compressed
+    project responses) are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                compressor = _StreamCompressor(encoding)
+                await send(start_message)
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, last=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, send_compressed)
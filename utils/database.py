@@ -0,0 +1,111 @@
+import os
+import threading
+from datetime import timezone
+from utils.metrics import mongo_event_listeners
+
+# pymongo is imported when the first client is created rather than at module
+# import, so it stays off the cold-start path of `import main`.
+
+MONGO_URI = os.getenv("MONGO_URI")
+
+# Connection pool settings, overridable per deployment
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+
+# Timeouts, kept short so an unreachable database fails requests in seconds
+# rather than after PyMongo's 30s server selection default
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "2000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "10000"))
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the process-wide MongoClient, creating it on first use.
+
+    The client owns a connection pool that is shared by every portfolio,
+    so server discovery and the TCP/TLS handshake only happen once per
+    process instead of once per request.
+
+    Datetimes are read back as timezone-aware UTC values, so they are
+    serialised with their +00:00 offset.
+
+    Returns:
+        pymongo.MongoClient: The shared client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import pymongo
+                _client = pymongo.MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                    tz_aware=True,
+                    tzinfo=timezone.utc,
+                    event_listeners=mongo_event_listeners(),
+                )
+    return _client
+
+
+def close_client():
+    """
+    Closes the shared MongoClient and its pool, if one was created.
+    The next call to get_client() opens a fresh one.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+_async_client = None
+
+
+def get_async_client():
+    """
+    Returns the process-wide AsyncMongoClient, creating it on first use.
+
+    Used by utils.async_business_logic so the route handlers can await
+    Mongo instead of holding a worker thread for the whole round-trip.
+    It has its own pool, configured with the same settings and timeouts as get_client().
+
+    Returns:
+        pymongo.AsyncMongoClient: The shared async client.
+    """
+    global _async_client
+    if _async_client is None:
+        import pymongo
+        _async_client = pymongo.AsyncMongoClient(
+            MONGO_URI,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            tz_aware=True,
+            tzinfo=timezone.utc,
+            event_listeners=mongo_event_listeners(),
+        )
+    return _async_client
+
+
+async def close_async_client():
+    """
+    Closes the shared AsyncMongoClient and its pool, if one was created.
+    """
+    global _async_client
+    if _async_client is not None:
+        client, _async_client = _async_client, None
+        await client.close()
@@ -0,0 +1,84 @@
+from datetime import date, datetime
+import orjson
+from bson.objectid import ObjectId
+from starlette.responses import JSONResponse
+
+# Types the JSON encoder already handles; checked first since they make up
+# almost every field of a project or message.
+_PASSTHROUGH_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def encode_value(value):
+    """
+    Converts a single BSON value into something the JSON encoder accepts.
+
+    ObjectIds become their hex string, datetimes and dates become ISO 8601
+    strings, and nested documents and arrays are encoded recursively.
+    Everything else is returned unchanged.
+    """
+    if type(value) in _PASSTHROUGH_TYPES:
+        return value
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return encode_document(value)
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def encode_document(document):
+    """
+    Converts a Mongo document into a plain JSON-ready dict.
+
+    Args:
+        document (dict): A document as returned by PyMongo.
+
+    Returns:
+        dict: A new dict with the same keys and JSON-compatible values.
+    """
+    return {key: encode_value(value) for key, value in document.items()}
+
+
+async def iter_ndjson(documents, chunk_size=65536):
+    """
+    Encodes an async iterable of Mongo documents as newline-delimited JSON.
+
+    Lines are grouped into chunks of roughly `chunk_size` bytes so a large
+    export is sent in a few hundred writes instead of one per document,
+    while only one chunk is ever held in memory.
+
+    Args:
+        documents: An async iterable of documents, e.g. a PyMongo AsyncCursor.
+        chunk_size (int): Approximate size in bytes of each yielded chunk.
+
+    Yields:
+        bytes: One or more complete NDJSON lines.
+    """
+    buffer = []
+    buffered = 0
+    async for document in documents:
+        line = orjson.dumps(encode_document(document)) + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialised with orjson, the default response class of the
+    app.
+
+    FastAPI ships a deprecated class of the same name; this one is kept
+    here so it keeps working when that is removed.
+    """
+
+    def render(self, content):
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
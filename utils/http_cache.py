@@ -0,0 +1,70 @@
+import hashlib
+import os
+import orjson
+from fastapi import Request, Response
+from utils.compression import COMPRESSION_MIN_SIZE, choose_encoding, compress_cached
+
+# Sent with cacheable project responses so browsers and the Vercel edge can
+# reuse them; override with PROJECT_CACHE_CONTROL.
+PROJECT_CACHE_CONTROL = os.getenv(
+    "PROJECT_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=600"
+)
+
+
+def make_etag(body: bytes):
+    """
+    Returns a strong ETag for a response body.
+    """
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Checks an If-None-Match header against `etag`, accepting `*`, lists of
+    tags and weak (W/) validators as RFC 9110 allows for GET.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def conditional_json_response(request: Request, payload, cache_control=PROJECT_CACHE_CONTROL):
+    """
+    Serialises `payload` as JSON with an ETag and Cache-Control header, or
+    returns an empty 304 when the client already holds this exact body.
+
+    Bodies of at least COMPRESSION_MIN_SIZE bytes are sent gzip or brotli
+    compressed when the client accepts it. The compressed body is cached
+    per ETag, and the ETag gets the encoding as a suffix since each encoding
+    is a different representation.
+
+    Args:
+        request (Request): The incoming request, read for If-None-Match.
+        payload: Anything orjson can serialise.
+        cache_control (str): Value of the Cache-Control header.
+
+    Returns:
+        Response: a 200 with the JSON body, or a 304 without one.
+    """
+    body = orjson.dumps(payload)
+    etag = make_etag(body)
+    encoding = None
+    if len(body) >= COMPRESSION_MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding:
+        etag = etag[:-1] + "-" + encoding + '"'
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        body = compress_cached(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
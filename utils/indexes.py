@@ -0,0 +1,147 @@
+"""
+Declared indexes of every portfolio database, and a query-plan check.
+
+INDEXES lists the indexes of each collection. ensure_indexes() and
+ensure_indexes_async() create them; create_indexes is a no-op for indexes
+that already exist, so both are safe to run on every start-up (warm-up
+does) or by hand:
+
+    python -m utils.indexes                  # every portfolio database
+    python -m utils.indexes --db ui_ux_portfolio --check
+
+find_collscans() runs explain() on each query the business layer issues
+and reports those that fall back to a collection scan; `--check` exits
+with status 1 when there are any, so it can run in CI against a seeded
+database.
+"""
+import argparse
+import sys
+from datetime import datetime, timezone
+from bson.objectid import ObjectId
+from utils.database import get_client, get_async_client
+from utils.business_logic import build_page_query, build_date_range_page_query, DATE_RANGE_SORT, build_text_search_query, get_all_databases, PROJECT_PROJECTION
+
+# collection -> indexes, each as the keys plus create_index options
+INDEXES = {
+    "project": [
+        {"keys": [("name", 1)], "name": "name_1"},
+        {
+            "keys": [("name", "text"), ("description", "text")],
+            "name": "project_text",
+            "weights": {"name": 5, "description": 1},
+        },
+    ],
+    "messages": [
+        # _id breaks ties in date-range pages, see build_date_range_page_query
+        {"keys": [("createdAt", 1), ("_id", 1)], "name": "createdAt_1__id_1"},
+    ],
+}
+
+
+def index_models(collection):
+    """
+    Returns:
+        list: The pymongo IndexModels declared for `collection`.
+    """
+    from pymongo import IndexModel
+
+    models = []
+    for spec in INDEXES.get(collection, []):
+        options = {key: value for key, value in spec.items() if key != "keys"}
+        models.append(IndexModel(spec["keys"], **options))
+    return models
+
+
+def ensure_indexes(DB):
+    """
+    Creates every index in INDEXES in one portfolio database.
+    """
+    db = get_client()[DB]
+    for collection in INDEXES:
+        db[collection].create_indexes(index_models(collection))
+
+
+async def ensure_indexes_async(DB):
+    """
+    ensure_indexes() on the shared AsyncMongoClient.
+    """
+    db = get_async_client()[DB]
+    for collection in INDEXES:
+        await db[collection].create_indexes(index_models(collection))
+
+
+def business_queries():
+    """
+    Returns the reads the business layer issues, as
+    (description, collection, filter, projection, sort) with sample values.
+    Writes use the same filters (by _id, or the date range for purges).
+    """
+    some_id = str(ObjectId())
+    page_filter, page_projection = build_page_query(after=some_id, fields=["name"])
+    text_filter, text_projection, text_sort = build_text_search_query("design")
+    return [
+        ("list projects", "project", {}, None, [("_id", 1)]),
+        ("page projects", "project", page_filter, page_projection, [("_id", 1)]),
+        ("project by id", "project", {"_id": ObjectId(some_id)}, PROJECT_PROJECTION, None),
+        ("search projects", "project", text_filter, text_projection, text_sort),
+        ("list messages", "messages", {}, None, [("_id", 1)]),
+        ("page messages", "messages", page_filter, None, [("_id", 1)]),
+        ("messages in date range", "messages", build_date_range_page_query(start=datetime(2000, 1, 1, tzinfo=timezone.utc)), None, DATE_RANGE_SORT),
+        ("next page of a date range", "messages", build_date_range_page_query(after=f"946684800000_{some_id}"), None, DATE_RANGE_SORT),
+        ("messages without createdAt", "messages", {"createdAt": {"$exists": False}}, {"_id": 1}, None),
+    ]
+
+
+def _plan_stages(plan):
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def find_collscans(DB):
+    """
+    Explains every query from business_queries() against one database.
+
+    Returns:
+        list: (description, stages of the winning plan) for each query
+              whose plan contains a COLLSCAN.
+    """
+    db = get_client()[DB]
+    collscans = []
+    for description, collection, _filter, projection, sort in business_queries():
+        cursor = db[collection].find(_filter, projection).limit(20)
+        if sort:
+            cursor = cursor.sort(sort)
+        stages = _plan_stages(cursor.explain()["queryPlanner"]["winningPlan"])
+        if "COLLSCAN" in stages:
+            collscans.append((description, stages))
+    return collscans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", action="append", help="portfolio database (repeatable); every one when omitted")
+    parser.add_argument("--check", action="store_true", help="explain the business-layer queries and fail on COLLSCAN")
+    args = parser.parse_args()
+
+    failed = False
+    for DB in args.db or get_all_databases():
+        ensure_indexes(DB)
+        print(f"{DB}: indexes ensured")
+        if args.check:
+            for description, stages in find_collscans(DB):
+                failed = True
+                print(f"{DB}: {description} is a collection scan ({' > '.join(stages)})")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Prometheus-style metrics collected in process, without a client library
+or any external service.
+
+MetricsMiddleware times every HTTP request and labels it with the
+portfolio prefix it was mounted under (e.g. /v1/product-design), the
+route template and the status code. mongo_event_listeners() returns PyMongo command and
+connection-pool listeners that record Mongo operation timings and pool
+usage. GET /metrics on the root app serves render() in the Prometheus
+text exposition format.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+
+
+def _format_labels(labelnames, labels, extra=()):
+    pairs = list(zip(labelnames, labels)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def set(self, labels=(), value=0):
+        with _lock:
+            self._values[labels] = value
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+    def render(self):
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values = {}
+
+    def observe(self, labels, value):
+        with _lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests handled.", ("mount", "route", "method", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("mount", "route", "method")
+)
+mongo_command_duration_seconds = Histogram(
+    "mongo_command_duration_seconds", "Mongo command latency.", ("command", "outcome")
+)
+mongo_pool_connections = Gauge(
+    "mongo_pool_connections", "Open connections in the Mongo pool.", ("address",)
+)
+mongo_pool_checked_out = Gauge(
+    "mongo_pool_checked_out", "Mongo connections currently checked out of the pool.", ("address",)
+)
+mongo_pool_checkout_failures_total = Counter(
+    "mongo_pool_checkout_failures_total", "Failed Mongo connection checkouts.", ("address", "reason")
+)
+
+METRICS = [
+    http_requests_total,
+    http_request_duration_seconds,
+    mongo_command_duration_seconds,
+    mongo_pool_connections,
+    mongo_pool_checked_out,
+    mongo_pool_checkout_failures_total,
+]
+
+
+def render(caches=()):
+    """
+    Args:
+        caches: (name, TTLCache) pairs whose hit/miss counters are included.
+
+    Returns:
+        str: every metric in the Prometheus text exposition format.
+    """
+    lines = []
+    with _lock:
+        for metric in METRICS:
+            lines.extend(metric.render())
+    cache_metrics = (("hits", "cache_hits_total", "Cache lookups that found a value."),
+                     ("misses", "cache_misses_total", "Cache lookups that found nothing."))
+    for key, name, documentation in cache_metrics:
+        if caches:
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} counter"]
+        for cache_name, cache in caches:
+            lines.append(f'{name}{{cache="{cache_name}"}} {cache.stats()[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def split_route(path, route_path, mounts):
+    """
+    Returns the portfolio mount a request path falls under and the route
+    template relative to it, e.g. /v1/product-design/get/project/123 with
+    template /get/project/{projectId} -> (/v1/product-design, /get/project/{projectId}).
+    """
+    for mount in mounts:
+        if path.startswith(mount + "/"):
+            if route_path.startswith(mount + "/"):
+                route_path = route_path[len(mount):]
+            return mount, route_path
+    return "", route_path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count and latency of every HTTP request.
+
+    Requests are labelled with the matched route template rather than the
+    raw path so ids don't create new series; anything that didn't match a
+    route is recorded as `unmatched`.
+    """
+
+    def __init__(self, app, mounts=()):
+        self.app = app
+        self.mounts = mounts
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            mount, path = split_route(scope["path"], route.path if route is not None else "unmatched", self.mounts)
+            http_request_duration_seconds.observe((mount, path, scope["method"]), time.perf_counter() - started)
+            http_requests_total.inc((mount, path, scope["method"], str(status_code)))
+
+
+def mongo_event_listeners():
+    """
+    Returns the PyMongo listeners that feed the mongo_* metrics, for the
+    `event_listeners` option of MongoClient and AsyncMongoClient.
+    """
+    from pymongo import monitoring
+
+    class CommandMetrics(monitoring.CommandListener):
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            mongo_command_duration_seconds.observe((event.command_name, "success"), event.duration_micros / 1e6)
+
+        def failed(self, event):
+            mongo_command_duration_seconds.observe((event.command_name, "failure"), event.duration_micros / 1e6)
+
+    class PoolMetrics(monitoring.ConnectionPoolListener):
+        def pool_created(self, event):
+            mongo_pool_connections.set((_address(event),), 0)
+            mongo_pool_checked_out.set((_address(event),), 0)
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            pass
+
+        def connection_created(self, event):
+            mongo_pool_connections.inc((_address(event),))
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_closed(self, event):
+            mongo_pool_connections.dec((_address(event),))
+
+        def connection_check_out_started(self, event):
+            pass
+
+        def connection_check_out_failed(self, event):
+            mongo_pool_checkout_failures_total.inc((_address(event), str(event.reason)))
+
+        def connection_checked_out(self, event):
+            mongo_pool_checked_out.inc((_address(event),))
+
+        def connection_checked_in(self, event):
+            mongo_pool_checked_out.dec((_address(event),))
+
+    return [CommandMetrics(), PoolMetrics()]
+
+
+def _address(event):
+    host, port = event.address
+    return f"{host}:{port}"
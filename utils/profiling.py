@@ -0,0 +1,127 @@
+"""
+Opt-in profiling of single requests.
+
+With PROFILING_ENABLED set and a PROFILING_SECRET configured, a request
+carrying `X-Profile: <secret>` runs under cProfile while a sampling thread
+records the event loop's stack every PROFILING_SAMPLE_INTERVAL seconds.
+Two files are written to PROFILING_DIR, named after the id returned in the
+response's X-Profile-Id header:
+
+    <id>.prof    cProfile stats, for pstats or snakeviz
+    <id>.folded  sampled stacks in the collapsed format read by
+                 flamegraph.pl and speedscope
+
+Only one request is profiled at a time; the profiler sees the whole event
+loop thread, so anything else the loop runs meanwhile shows up too. When
+profiling is disabled main.py doesn't add the middleware at all, so
+ordinary requests pay nothing.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILING_SECRET = os.getenv("PROFILING_SECRET", "")
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_SAMPLE_INTERVAL = float(os.getenv("PROFILING_SAMPLE_INTERVAL", "0.001"))
+
+PROFILE_HEADER = b"x-profile"
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread from a background thread and counts
+    identical stacks.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self):
+        """
+        Returns:
+            str: one `frame;frame;frame count` line per distinct stack.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests carrying the profiling secret.
+    """
+
+    def __init__(self, app, secret, directory=PROFILING_DIR, interval=PROFILING_SAMPLE_INTERVAL):
+        self.app = app
+        self.secret = secret.encode()
+        self.directory = directory
+        self.interval = interval
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            sampler.stop()
+            self._active = False
+            self._save(profile_id, scope, profiler, sampler)
+
+    def _wants_profile(self, scope):
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.secret)
+        return False
+
+    def _save(self, profile_id, scope, profiler, sampler):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile_id)
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".folded", "w") as folded:
+            folded.write(sampler.folded())
+        logger.info("profiled %s %s into %s.prof and %s.folded (%d samples)",
+                    scope["method"], scope["path"], base, base, sum(sampler.stacks.values()))
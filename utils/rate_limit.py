@@ -0,0 +1,174 @@
+"""
+In-memory rate limiting and load shedding for the write endpoints.
+
+RateLimitMiddleware wraps the root app, in front of every portfolio's
+routes, and for write requests only (POST, PUT, PATCH, DELETE) checks a
+token bucket for the client's IP, a global token bucket and the number of writes already in
+flight. Requests over a limit are answered with 429 (or 503 when
+shedding) and a Retry-After header before any body parsing or Mongo work.
+
+The limiter state is per process; with several workers each enforces its
+own share of the limits.
+
+Clients are told apart by the peer address of the connection. Behind a
+proxy or load balancer that is the proxy for every request, which would
+turn the per-client limit into one tiny global limit, so the limiter is
+only on by default when RATE_LIMIT_TRUST_FORWARDED says to take the
+client from X-Forwarded-For. Set RATE_LIMIT_ENABLED=1 to use it without
+a proxy, or 0 to turn it off either way.
+
+Proxies append the address they received the request from to
+X-Forwarded-For, so only the entries added by our own proxies can be
+trusted; anything to their left was sent by the client. The client is
+the entry RATE_LIMIT_TRUSTED_PROXIES places from the right (1 for a
+single proxy or load balancer in front of the app).
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from starlette.responses import JSONResponse
+
+# take the client IP from X-Forwarded-For, for deployments behind a proxy
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "").lower() in ("1", "true", "yes")
+# how many proxies in front of the app append to X-Forwarded-For
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+# off by default unless clients can be told apart behind the proxy, see above
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1" if RATE_LIMIT_TRUST_FORWARDED else "").lower() in ("1", "true", "yes")
+# requests per second and burst size for a single client IP
+RATE_LIMIT_CLIENT_RATE = float(os.getenv("RATE_LIMIT_CLIENT_RATE", "0.2"))
+RATE_LIMIT_CLIENT_BURST = float(os.getenv("RATE_LIMIT_CLIENT_BURST", "5"))
+# requests per second and burst size across all clients
+RATE_LIMIT_GLOBAL_RATE = float(os.getenv("RATE_LIMIT_GLOBAL_RATE", "20"))
+RATE_LIMIT_GLOBAL_BURST = float(os.getenv("RATE_LIMIT_GLOBAL_BURST", "40"))
+MAX_CONCURRENT_WRITES = int(os.getenv("MAX_CONCURRENT_WRITES", "32"))
+
+WRITE_METHODS = frozenset(("POST", "PUT", "PATCH", "DELETE"))
+
+
+class TokenBucket:
+    """
+    Holds up to `burst` tokens, refilled at `rate` tokens per second.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def take(self):
+        """
+        Takes one token.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds until one is available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Per-client and global token buckets plus an in-flight write counter
+    for the whole process.
+    """
+
+    def __init__(self, client_rate, client_burst, global_rate, global_burst, max_concurrent, max_clients=10000):
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.max_concurrent = max_concurrent
+        self.max_clients = max_clients
+        self.in_flight = 0
+        self._clients = OrderedDict()
+
+    def check(self, client):
+        """
+        Returns:
+            tuple: (status_code, retry_after) when the request must be
+                   rejected, or None when it may go ahead.
+        """
+        if self.in_flight >= self.max_concurrent:
+            return 503, 1
+        bucket = self._clients.get(client)
+        if bucket is None:
+            bucket = self._clients[client] = TokenBucket(self.client_rate, self.client_burst)
+            if len(self._clients) > self.max_clients:
+                self._clients.popitem(last=False)
+        else:
+            self._clients.move_to_end(client)
+        wait = bucket.take()
+        if wait:
+            return 429, wait
+        wait = self.global_bucket.take()
+        if wait:
+            return 429, wait
+        return None
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that applies a RateLimiter to write requests.
+    """
+
+    def __init__(self, app, limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        rejected = self.limiter.check(client_ip(scope))
+        if rejected:
+            status_code, retry_after = rejected
+            detail = "Too many requests" if status_code == 429 else "Server is busy, try again shortly"
+            response = JSONResponse(
+                {"detail": detail},
+                status_code=status_code,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.limiter.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.in_flight -= 1
+
+
+def client_ip(scope, trust_forwarded=RATE_LIMIT_TRUST_FORWARDED, trusted_proxies=RATE_LIMIT_TRUSTED_PROXIES):
+    """
+    Returns the IP address the request came from.
+
+    With `trust_forwarded`, that is the X-Forwarded-For entry added by the
+    outermost of `trusted_proxies` proxies, i.e. counted from the right:
+    the entries to its left come from the client and can be made up.
+    """
+    if trust_forwarded:
+        forwarded = []
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                forwarded += [entry.strip() for entry in value.decode("latin-1").split(",") if entry.strip()]
+        if forwarded:
+            # fewer entries than proxies: every one was added by a proxy of ours
+            return forwarded[-max(1, min(trusted_proxies, len(forwarded)))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+write_limiter = RateLimiter(
+    RATE_LIMIT_CLIENT_RATE,
+    RATE_LIMIT_CLIENT_BURST,
+    RATE_LIMIT_GLOBAL_RATE,
+    RATE_LIMIT_GLOBAL_BURST,
+    MAX_CONCURRENT_WRITES,
+)
@@ -0,0 +1,148 @@
+"""
+Per-portfolio JSON snapshots of the project list.
+
+With SNAPSHOT_MODE set, every project write regenerates
+SNAPSHOT_DIR/<DB>.json, holding the full project list and a version number
+that goes up by one per regeneration. Project reads are answered from the
+snapshot, and only fall back to Mongo when it doesn't exist yet (which
+also writes it). A snapshot that fails to regenerate is removed rather
+than left stale, so reads go to Mongo until a regeneration succeeds.
+
+Regeneration takes an exclusive lock on SNAPSHOT_DIR/<DB>.lock, reads the
+projects from Mongo and writes the file with an atomic rename. The lock is
+what makes the snapshots safe across uvicorn workers: a later writer
+always reads Mongo after an earlier one has finished, so a newer version
+never holds older data. Readers don't lock; they stat the file and only
+re-parse it when it has changed, so every worker shares the same file
+through the page cache and keeps one parsed copy.
+"""
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+import orjson
+from utils.database import get_client
+from utils.encoding import encode_document
+
+SNAPSHOT_MODE = os.getenv("SNAPSHOT_MODE", "").lower() in ("1", "true", "yes")
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+
+# DB -> ((st_ino, st_mtime_ns, st_size), snapshot) of the last file parsed
+_loaded = {}
+_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_path(DB):
+    return os.path.join(SNAPSHOT_DIR, f"{DB}.json")
+
+
+def regenerate_snapshot(DB):
+    """
+    Writes a new snapshot of DB's projects from Mongo.
+
+    Blocks on the database's lock file, so call it from a thread when on
+    the event loop.
+
+    Returns:
+        int: The version of the new snapshot.
+    """
+    import fcntl  # POSIX only, and only needed in snapshot mode
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(os.path.join(SNAPSHOT_DIR, f"{DB}.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        current = read_snapshot(DB)
+        version = current["version"] + 1 if current else 1
+        projects = [encode_document(project) for project in get_client()[DB].project.find().sort("_id", 1)]
+        body = orjson.dumps({
+            "version": version,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "projects": projects,
+        })
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, prefix=f".{DB}.", suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temporary_file:
+                temporary_file.write(body)
+                temporary_file.flush()
+                os.fsync(temporary_file.fileno())
+            os.replace(temporary_path, snapshot_path(DB))
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+    return version
+
+
+def refresh_snapshot(DB):
+    """
+    regenerate_snapshot() for callers that mustn't fail because of it, like
+    a write that Mongo has already committed. On failure the error is
+    logged and DB's snapshot is removed, since it no longer matches Mongo.
+
+    Returns:
+        bool: Whether a new snapshot was written.
+    """
+    try:
+        regenerate_snapshot(DB)
+        return True
+    except Exception:
+        logger.exception("couldn't regenerate the %s snapshot, removing it", DB)
+    try:
+        os.remove(snapshot_path(DB))
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.exception("couldn't remove the stale %s snapshot", DB)
+    return False
+
+
+def read_snapshot(DB):
+    """
+    Returns DB's current snapshot, parsing the file only if it changed
+    since the last call.
+
+    Returns:
+        dict | None: version, generated_at, projects (sorted by _id) and
+                     by_id (_id -> project), or None if there is no snapshot.
+    """
+    path = snapshot_path(DB)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    loaded = _loaded.get(DB)
+    if loaded is not None and loaded[0] == signature:
+        return loaded[1]
+    try:
+        with open(path, "rb") as snapshot_file:
+            snapshot = orjson.loads(snapshot_file.read())
+    except FileNotFoundError:
+        return None
+    snapshot["by_id"] = {project["_id"]: project for project in snapshot["projects"]}
+    with _lock:
+        _loaded[DB] = (signature, snapshot)
+    return snapshot
+
+
+def snapshot_page(snapshot, limit=None, after=None, fields=None):
+    """
+    Pages through a snapshot the way get_all_projects_func pages through
+    the collection: sorted by _id, starting after `after`.
+
+    ObjectId hex strings sort in the same order as the ObjectIds, so the
+    string comparison matches Mongo's.
+    """
+    projects = snapshot["projects"]
+    if after:
+        projects = [project for project in projects if project["_id"] > after]
+    if limit:
+        projects = projects[:limit]
+    if fields:
+        projects = [
+            {key: value for key, value in project.items() if key == "_id" or key in fields}
+            for project in projects
+        ]
+    return projects
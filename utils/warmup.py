@@ -0,0 +1,55 @@
+"""
+Start-up warm-up for the API, run from the root app's lifespan.
+
+A fresh container otherwise pays for Mongo server selection, connection
+setup and the first collection scans on its first requests. warm_up()
+does that work up front, and warm_up_until_ready() retries it in the
+background until it succeeds so an unreachable database delays readiness
+instead of crashing the process. GET /ready reports the result.
+"""
+import asyncio
+import logging
+import os
+from utils.database import get_async_client
+from utils.async_business_logic import get_all_projects_func
+from utils.indexes import ensure_indexes_async
+
+# load every portfolio's project list into the read cache during warm-up
+WARMUP_PRELOAD = os.getenv("WARMUP_PRELOAD", "1").lower() in ("1", "true", "yes")
+WARMUP_RETRY_INTERVAL = float(os.getenv("WARMUP_RETRY_INTERVAL", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(databases, preload=WARMUP_PRELOAD):
+    """
+    Connects to Mongo, ensures the indexes of every portfolio database and,
+    if `preload` is set, primes the project cache.
+
+    Args:
+        databases (list): Names of the portfolio databases.
+        preload (bool): Whether to load the project lists.
+    """
+    await get_async_client().admin.command("ping")
+    await asyncio.gather(*(ensure_indexes_async(DB) for DB in databases))
+    if preload:
+        await asyncio.gather(*(get_all_projects_func(DB) for DB in databases))
+
+
+async def warm_up_until_ready(state, databases):
+    """
+    Runs warm_up() until it succeeds, then sets `state.ready`.
+
+    Args:
+        state: The app's `state`, whose `ready` flag GET /ready reports.
+        databases (list): Names of the portfolio databases.
+    """
+    while True:
+        try:
+            await warm_up(databases)
+        except Exception:
+            logger.exception("warm-up failed, retrying in %ss", WARMUP_RETRY_INTERVAL)
+            await asyncio.sleep(WARMUP_RETRY_INTERVAL)
+            continue
+        state.ready = True
+        return
@@ -0,0 +1,203 @@
+"""
+Write-behind queue for documents that don't need to be in Mongo before the
+client gets a response, like contact form submissions.
+
+Documents get their ObjectId up front, are acknowledged straight away and
+are written with insert_many by a background task once `flush_size`
+documents are waiting or `flush_interval` seconds have passed. Every
+queued document is also appended to a local spill file, which is rewritten
+after each successful flush and replayed on the next start, so anything
+still pending when the process stops is written later instead of lost.
+
+Each process spills to its own file, `<spill_path>.<pid>`, so uvicorn
+workers never rewrite each other's entries. On start a worker also takes
+over the spill files of processes that are no longer running (and a
+plain `<spill_path>` from older versions): their entries are queued and
+moved into its own file, and the old files are removed. A document
+replayed twice is harmless, since it keeps its _id and the second insert
+is skipped as a duplicate.
+
+Only enable it (CONTACT_WRITE_BEHIND=1) where the process outlives the
+request, e.g. the Docker image; serverless runtimes may freeze the
+background task between requests.
+"""
+import asyncio
+import glob
+import logging
+import os
+from bson import json_util
+from bson.objectid import ObjectId
+from utils.database import get_async_client
+
+CONTACT_WRITE_BEHIND = os.getenv("CONTACT_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+CONTACT_FLUSH_SIZE = int(os.getenv("CONTACT_FLUSH_SIZE", "100"))
+CONTACT_FLUSH_INTERVAL = float(os.getenv("CONTACT_FLUSH_INTERVAL", "1.0"))
+CONTACT_SPILL_PATH = os.getenv("CONTACT_SPILL_PATH", "contact_messages.spill")
+
+DUPLICATE_KEY_ERROR = 11000
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Buffers documents per database and flushes them to `collection` with
+    insert_many from a background task.
+    """
+
+    def __init__(self, collection, flush_size=100, flush_interval=1.0, spill_path=None):
+        self.collection = collection
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+
+    def enqueue(self, DB, document):
+        """
+        Queues `document` for insertion into DB and returns its new ObjectId.
+        """
+        document.setdefault("_id", ObjectId())
+        self._pending.append((DB, document))
+        if self.spill_path:
+            with open(self.spill_file, "a") as spill:
+                spill.write(json_util.dumps({"DB": DB, "document": document}) + "\n")
+        if len(self._pending) >= self.flush_size:
+            self._wakeup.set()
+        return document["_id"]
+
+    @property
+    def spill_file(self):
+        """
+        This process's spill file.
+        """
+        return f"{self.spill_path}.{os.getpid()}"
+
+    async def start(self):
+        """
+        Replays the spill files left by previous runs and starts the flush loop.
+        """
+        orphans = self._orphaned_spill_files()
+        replayed = []
+        for path in [self.spill_file, *orphans]:
+            replayed.extend(self._read_spill(path))
+        self._pending = replayed + self._pending
+        if orphans:
+            # keep the adopted entries in our own file before dropping theirs
+            self._rewrite_spill()
+            for path in orphans:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:  # another worker adopted it too
+                    pass
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the flush loop and writes whatever is still pending. Anything
+        that can't be written stays in the spill file for the next start.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("write-behind flush failed on shutdown; %d documents kept in %s", len(self._pending), self.spill_file)
+
+    async def flush(self):
+        """
+        Writes every pending document with one insert_many per database.
+        On failure or cancellation the documents are put back in the queue.
+        """
+        from pymongo.errors import BulkWriteError
+
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            by_database = {}
+            for DB, document in batch:
+                by_database.setdefault(DB, []).append(document)
+            try:
+                cli = get_async_client()
+                for DB, documents in by_database.items():
+                    try:
+                        await cli[DB][self.collection].insert_many(documents, ordered=False)
+                    except BulkWriteError as e:
+                        # Documents already written by an earlier, partly failed flush
+                        # come back as duplicate keys; anything else is a real failure.
+                        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                            raise
+            except BaseException:
+                # including cancellation by stop(), which flushes them again
+                self._pending = batch + self._pending
+                raise
+            self._rewrite_spill()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("write-behind flush failed; %d documents will be retried", len(self._pending))
+
+    def _orphaned_spill_files(self):
+        # spill files of other processes that have stopped
+        if not self.spill_path:
+            return []
+        orphans = [self.spill_path] if os.path.exists(self.spill_path) else []
+        for path in glob.glob(glob.escape(self.spill_path) + ".*"):
+            pid = path[len(self.spill_path) + 1:]
+            if pid.isdigit() and int(pid) != os.getpid() and not _process_running(int(pid)):
+                orphans.append(path)
+        return orphans
+
+    def _read_spill(self, path):
+        if not self.spill_path or not os.path.exists(path):
+            return []
+        with open(path) as spill:
+            entries = [json_util.loads(line) for line in spill if line.strip()]
+        return [(entry["DB"], entry["document"]) for entry in entries]
+
+    def _rewrite_spill(self):
+        # Only documents queued while the flush was running are left.
+        if not self.spill_path:
+            return
+        temporary_path = self.spill_file + ".tmp"
+        with open(temporary_path, "w") as spill:
+            for DB, document in self._pending:
+                spill.write(json_util.dumps({"DB": DB, "document": document}) + "\n")
+        os.replace(temporary_path, self.spill_file)
+
+
+def _process_running(pid):
+    if os.name != "posix":
+        # os.kill() can't probe a process elsewhere; leave the file alone
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # running, as another user
+        return True
+    return True
+
+
+contact_message_queue = WriteBehindQueue(
+    "messages",
+    flush_size=CONTACT_FLUSH_SIZE,
+    flush_interval=CONTACT_FLUSH_INTERVAL,
+    spill_path=CONTACT_SPILL_PATH,
+)